@@ -5,15 +5,9 @@ A Domain-Specific Language built in Python for writing concise, readable tests
 for Zig code using FFI (Foreign Function Interface).
 """
 
+import importlib
+
 from .test_runner import TestRunner, TestSuite
-from .zig_ffi import ZigLibrary
-from .builder import ZigBuilder, PZSpecConfig, auto_build
-from .factory import (
-    StructFactory,
-    factory_field,
-    sequence,
-    trait,
-)
 from .dsl import (
     test,
     describe,
@@ -27,6 +21,7 @@ from .dsl import (
     assert_true,
     assert_false,
     assert_almost_equal,
+    assert_all_almost_equal,
     set_runner,
     before_all,
     after_all,
@@ -35,26 +30,48 @@ from .dsl import (
     before,
     after,
 )
-from .mock import (
-    mock_zig_function,
-    assert_called,
-    assert_called_once,
-    assert_called_with,
-    get_call_count,
-    get_calls,
-)
-from .memory import (
-    track_memory,
-    check_leaks,
-    assert_no_leaks,
-    MemoryLeakError,
-)
-from .sentinel import (
-    Sentinel,
-    NO_ENTITY,
-    NO_INDEX,
-    INVALID_ID,
-)
+
+# Heavier helpers are imported on first access (PEP 562), so test files
+# that only use the DSL don't pay for subprocess, ctypes loading, etc.
+_LAZY_ATTRS = {
+    "ZigLibrary": "zig_ffi",
+    "ZigBuilder": "builder",
+    "PZSpecConfig": "builder",
+    "auto_build": "builder",
+    "StructFactory": "factory",
+    "factory_field": "factory",
+    "sequence": "factory",
+    "trait": "factory",
+    "mock_zig_function": "mock",
+    "assert_called": "mock",
+    "assert_called_once": "mock",
+    "assert_called_with": "mock",
+    "get_call_count": "mock",
+    "get_calls": "mock",
+    "track_memory": "memory",
+    "check_leaks": "memory",
+    "assert_no_leaks": "memory",
+    "MemoryLeakError": "memory",
+    "Sentinel": "sentinel",
+    "NO_ENTITY": "sentinel",
+    "NO_INDEX": "sentinel",
+    "INVALID_ID": "sentinel",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
+
 
 # CLI is available but not exported by default
 # Access via: from pzspec.cli import main
@@ -82,6 +99,7 @@ __all__ = [
     "assert_true",
     "assert_false",
     "assert_almost_equal",
+    "assert_all_almost_equal",
     "set_runner",
     "before_all",
     "after_all",
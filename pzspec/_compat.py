@@ -0,0 +1,10 @@
+"""
+Compatibility helpers shared across pzspec modules.
+"""
+
+import sys
+
+
+# dataclass options giving instances __slots__ (no per-instance __dict__)
+# where supported; slots=True needs Python 3.10+
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
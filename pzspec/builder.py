@@ -6,44 +6,154 @@ manual build scripts.
 """
 
 import os
+import sys
 import subprocess
-import platform
+import functools
+import threading
 from pathlib import Path
-from typing import Optional, Dict, Any
-import json
+from typing import Optional, Dict, Any, List
+
+# orjson is optional; PZSpec itself only requires the standard library
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+    _json_loads = json.loads  # Accepts bytes and detects the encoding
+
+
+# Shared library extension for the current platform, computed once at import.
+# sys.platform is used instead of platform.system() to avoid importing platform.
+if sys.platform == "darwin":
+    _PLATFORM_LIB_EXT: Optional[str] = ".dylib"
+elif sys.platform.startswith("linux"):
+    _PLATFORM_LIB_EXT = ".so"
+elif sys.platform.startswith("win"):
+    _PLATFORM_LIB_EXT = ".dll"
+else:
+    _PLATFORM_LIB_EXT = None  # Unsupported platform
+
+# Extension the builders use, defaulting to .so on unsupported platforms
+_LIB_EXT = _PLATFORM_LIB_EXT or ".so"
+
+
+def _supported_lib_ext() -> str:
+    """The platform's library extension, raising on unsupported platforms."""
+    if _PLATFORM_LIB_EXT is None:
+        raise RuntimeError(f"Unsupported platform: {sys.platform}")
+    return _PLATFORM_LIB_EXT
+
+
+# Zig's local build cache, kept in the project root so repeated builds
+# (including coverage builds from a scratch directory) reuse compiled artifacts
+ZIG_CACHE_DIR = ".zig-cache"
+
+
+@functools.lru_cache(maxsize=32)
+def _load_pzspec(path_str: str, mtime_ns: int) -> Dict[str, Any]:
+    """
+    Parse a .pzspec file.
+
+    Cached on (path, mtime) so repeated PZSpecConfig construction in the
+    same process skips re-reading unchanged files.
+    """
+    return _json_loads(Path(path_str).read_bytes())
+
+
+def _ensure_dir(path) -> None:
+    """Create path (and parents) unless it is already a directory."""
+    # A stat is cheaper than a mkdir syscall that fails with EEXIST
+    if not os.path.isdir(path):
+        os.makedirs(path, exist_ok=True)
+
+
+def _first_zig_file(directory) -> Optional[Path]:
+    """
+    Return the alphabetically first .zig file directly inside directory.
+
+    Uses a single os.scandir pass and only builds a Path for the winner, so
+    the choice is deterministic regardless of filesystem listing order.
+    """
+    first = None
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.name.endswith('.zig') and entry.is_file():
+                    if first is None or entry.name < first.name:
+                        first = entry
+    except OSError:
+        return None
+    return Path(first.path) if first is not None else None
 
 
 class PZSpecConfig:
     """Configuration for a PZSpec project."""
+
+    # Expected types of the documented .pzspec options
+    OPTION_TYPES: Dict[str, type] = {
+        "library_name": str,
+        "source_file": str,
+        "optimize": str,
+        "build_dir": str,
+        "build_flags": list,
+    }
     
     def __init__(self, project_root: Path):
         self.project_root = project_root
         self.config_file = project_root / ".pzspec"
         self.config: Dict[str, Any] = {}
         self._load_config()
+
+        # Resolve options once so repeated reads are plain attribute lookups
+        # Library name, defaulting to project directory name
+        self.library_name: str = self.get("library_name", self.project_root.name)
+        # Optimization level
+        self.optimize: str = self.get("optimize", "ReleaseSafe")
+        # Build output directory
+        self.build_dir: Path = self.project_root / self.get("build_dir", "zig-out/lib")
+        # Additional flags for zig build-lib
+        self.build_flags: List[str] = list(self.get("build_flags", []))
     
     def _load_config(self):
         """Load configuration from .pzspec file if it exists."""
-        if self.config_file.exists():
-            try:
-                with open(self.config_file, 'r') as f:
-                    self.config = json.load(f)
-            except (json.JSONDecodeError, IOError) as e:
-                print(f"Warning: Could not parse .pzspec file: {e}")
-                self.config = {}
-        else:
+        try:
+            st = self.config_file.stat()
+        except FileNotFoundError:
+            self.config = {}
+            return
+
+        try:
+            config = _load_pzspec(str(self.config_file), st.st_mtime_ns)
+        except (ValueError, OSError) as e:
+            print(f"Warning: Could not parse .pzspec file: {e}")
             self.config = {}
+            return
+
+        if not isinstance(config, dict):
+            print("Warning: .pzspec must contain a JSON object, ignoring it")
+            self.config = {}
+            return
+
+        # Copy so callers mutating the config don't corrupt the cache
+        self.config = dict(config)
+        self._validate()
+
+    def _validate(self):
+        """Drop known options that have the wrong type, with a warning."""
+        for key, expected in self.OPTION_TYPES.items():
+            value = self.config.get(key)
+            if value is not None and not isinstance(value, expected):
+                print(
+                    f"Warning: .pzspec option '{key}' should be a {expected.__name__}, "
+                    f"got {type(value).__name__}; using the default"
+                )
+                del self.config[key]
     
     def get(self, key: str, default: Any = None) -> Any:
         """Get a configuration value."""
         return self.config.get(key, default)
     
-    @property
-    def library_name(self) -> str:
-        """Get the library name, defaulting to project directory name."""
-        return self.get("library_name", self.project_root.name)
-    
-    @property
+    @functools.cached_property
     def source_file(self) -> Optional[Path]:
         """Get the source file path."""
         source = self.get("source_file")
@@ -51,26 +161,11 @@ class PZSpecConfig:
             return self.project_root / source
         # Convention: look for src/*.zig or src/lib.zig
         src_dir = self.project_root / "src"
-        if src_dir.exists():
-            # Prefer lib.zig, then any .zig file
-            lib_zig = src_dir / "lib.zig"
-            if lib_zig.exists():
-                return lib_zig
-            zig_files = list(src_dir.glob("*.zig"))
-            if zig_files:
-                return zig_files[0]
-        return None
-    
-    @property
-    def optimize(self) -> str:
-        """Get optimization level."""
-        return self.get("optimize", "ReleaseSafe")
-    
-    @property
-    def build_dir(self) -> Path:
-        """Get build output directory."""
-        build_dir = self.get("build_dir", "zig-out/lib")
-        return self.project_root / build_dir
+        # Prefer lib.zig, then the first .zig file by name
+        lib_zig = src_dir / "lib.zig"
+        if lib_zig.exists():
+            return lib_zig
+        return _first_zig_file(src_dir)
 
 
 class ZigBuilder:
@@ -79,45 +174,69 @@ class ZigBuilder:
     def __init__(self, project_root: Path):
         self.project_root = Path(project_root).resolve()
         self.config = PZSpecConfig(self.project_root)
+
+        # The expected library path never changes for a builder, so resolve it once
+        build_dir = self.config.build_dir
+        # Handle relative paths
+        if not build_dir.is_absolute():
+            build_dir = self.project_root / build_dir
+        self._library_path = build_dir / f"lib{self.config.library_name}{_LIB_EXT}"
+
+        # Set once the library is known to be up to date for this process
+        self._fresh = False
     
     def _get_library_extension(self) -> str:
         """Get the library extension for the current platform."""
-        system = platform.system()
-        if system == "Darwin":
-            return ".dylib"
-        elif system == "Linux":
-            return ".so"
-        elif system == "Windows":
-            return ".dll"
-        else:
-            return ".so"  # Default
+        return _LIB_EXT
     
     def _get_library_path(self) -> Path:
         """Get the expected library path."""
-        ext = self._get_library_extension()
-        lib_name = f"lib{self.config.library_name}{ext}"
-        build_dir = self.config.build_dir
-        # Handle relative paths
-        if not build_dir.is_absolute():
-            build_dir = self.project_root / build_dir
-        return build_dir / lib_name
+        return self._library_path
     
     def library_exists(self) -> bool:
         """Check if the library already exists."""
-        return self._get_library_path().exists()
+        return os.path.exists(self._library_path)
+
+    def is_fresh(self) -> bool:
+        """
+        Check if the library exists and is newer than its source file.
+
+        The result is cached once the library is found to be fresh, so
+        repeated calls in the same process don't touch the filesystem.
+        """
+        if self._fresh:
+            return True
+
+        try:
+            lib_mtime = os.stat(self._library_path).st_mtime_ns
+        except OSError:
+            return False
+
+        source_file = self.config.source_file
+        if source_file is not None:
+            try:
+                if os.stat(source_file).st_mtime_ns > lib_mtime:
+                    return False
+            except OSError:
+                pass  # Source missing; an existing library is all we have
+
+        self._fresh = True
+        return True
     
     def build(self, force: bool = False) -> bool:
         """
         Build the Zig shared library.
         
         Args:
-            force: If True, rebuild even if library exists
+            force: If True, rebuild even if library is up to date
         
         Returns:
             True if build succeeded, False otherwise
         """
-        if not force and self.library_exists():
+        if not force and self.is_fresh():
             return True
+
+        self._fresh = False
         
         source_file = self.config.source_file
         if not source_file or not source_file.exists():
@@ -127,12 +246,12 @@ class ZigBuilder:
             return False
         
         # Ensure build directory exists
-        self.config.build_dir.mkdir(parents=True, exist_ok=True)
+        output_path = self._library_path
+        _ensure_dir(output_path.parent)
         
         # Build command
-        ext = self._get_library_extension()
-        lib_name = f"lib{self.config.library_name}{ext}"
-        output_path = self.config.build_dir / lib_name
+        ext = _LIB_EXT
+        lib_name = output_path.name
         
         cmd = [
             "zig", "build-lib",
@@ -141,28 +260,30 @@ class ZigBuilder:
             "-fPIC",
             str(source_file),
             "--name", self.config.library_name,
+            "--cache-dir", str(self.project_root / ZIG_CACHE_DIR),
         ]
         
         # Add custom build flags if specified
-        extra_flags = self.config.get("build_flags", [])
+        extra_flags = self.config.build_flags
         if extra_flags:
             cmd.extend(extra_flags)
         
         try:
             print(f"Building {lib_name}...")
-            result = subprocess.run(
+            # Zig's stdout isn't used; stderr is kept as bytes and only
+            # decoded if the build fails
+            subprocess.run(
                 cmd,
-                cwd=str(self.project_root),
+                cwd=self.project_root,
                 check=True,
-                capture_output=True,
-                text=True
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
             )
             
             # Move library to expected location if needed
             # Zig might create it in current directory
             current_dir_lib = self.project_root / lib_name
             if current_dir_lib.exists() and current_dir_lib != output_path:
-                output_path.parent.mkdir(parents=True, exist_ok=True)
                 current_dir_lib.rename(output_path)
                 print(f"  → {output_path}")
             
@@ -170,12 +291,12 @@ class ZigBuilder:
             fallback_pattern = f"liblib.{ext[1:]}"  # Remove leading dot
             fallback_lib = self.project_root / fallback_pattern
             if fallback_lib.exists():
-                output_path.parent.mkdir(parents=True, exist_ok=True)
                 fallback_lib.rename(output_path)
                 print(f"  → {output_path} (renamed from {fallback_pattern})")
             
             if output_path.exists():
                 print(f"✓ Built successfully: {output_path}")
+                self._fresh = True
                 return True
             else:
                 print(f"Warning: Library not found at expected location: {output_path}")
@@ -183,7 +304,7 @@ class ZigBuilder:
                 
         except subprocess.CalledProcessError as e:
             print(f"Error building library:")
-            print(e.stderr)
+            print(e.stderr.decode('utf-8', errors='replace'))
             return False
         except FileNotFoundError:
             print("Error: 'zig' command not found. Is Zig installed?")
@@ -196,6 +317,12 @@ class ZigBuilder:
         return None
 
 
+# ZigBuilder instances reused by auto_build(), keyed by project root
+_builders: Dict[str, ZigBuilder] = {}
+# Serializes auto_build() so concurrently loaded test files build only once
+_builders_lock = threading.Lock()
+
+
 def auto_build(project_root: Optional[Path] = None) -> Optional[Path]:
     """
     Automatically build Zig library if needed.
@@ -209,11 +336,17 @@ def auto_build(project_root: Optional[Path] = None) -> Optional[Path]:
     if project_root is None:
         project_root = Path.cwd()
     
-    builder = ZigBuilder(project_root)
-    
-    if not builder.library_exists():
+    with _builders_lock:
+        # Reuse the builder per project so its freshness check is only done once
+        key = str(project_root)
+        builder = _builders.get(key)
+        if builder is None:
+            builder = ZigBuilder(project_root)
+            _builders[key] = builder
+        
+        # build() returns immediately when the library is newer than its source
         if not builder.build():
             return None
-    
-    return builder.get_library_path()
+        
+        return builder.get_library_path()
 
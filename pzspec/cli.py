@@ -6,13 +6,52 @@ Allows running tests from any directory after installing PZSpec via pip.
 """
 
 import os
+import re
 import sys
 import argparse
+import contextlib
+import functools
+import importlib.util
 from pathlib import Path
 from typing import Optional, List
 
-from .test_runner import TestRunner
-from .dsl import set_runner
+from . import __version__
+
+
+# Upper bound on parent directories visited by find_pzspec_dir
+_MAX_SEARCH_DEPTH = 64
+
+
+def _has_test_files(directory) -> bool:
+    """Check whether a directory contains at least one test_*.py file."""
+    try:
+        with os.scandir(directory) as it:
+            return any(
+                entry.name.startswith("test_") and entry.name.endswith(".py")
+                for entry in it
+            )
+    except OSError:
+        # Missing path or not a directory
+        return False
+
+
+@functools.lru_cache(maxsize=32)
+def _find_pzspec_root(start: str) -> Optional[str]:
+    """Walk up from a resolved start path; cached per start path."""
+    current = start
+
+    # Check current directory and its parents, using plain string paths
+    for _ in range(_MAX_SEARCH_DEPTH):
+        # Verify the pzspec directory exists and has test files
+        if _has_test_files(os.path.join(current, "pzspec")):
+            return current
+
+        parent = os.path.dirname(current)
+        if parent == current:
+            break
+        current = parent
+
+    return None
 
 
 def find_pzspec_dir(start_path: Optional[Path] = None) -> Optional[Path]:
@@ -21,31 +60,59 @@ def find_pzspec_dir(start_path: Optional[Path] = None) -> Optional[Path]:
 
     Looks for a 'pzspec/' directory containing test files.
     """
-    if start_path is None:
-        start_path = Path.cwd()
-
-    current = Path(start_path).resolve()
+    root = _find_pzspec_root(
+        os.path.realpath(start_path if start_path is not None else os.getcwd())
+    )
+    return Path(root) if root is not None else None
 
-    # Check current directory and all parents
-    while current != current.parent:
-        pzspec_dir = current / "pzspec"
-        if pzspec_dir.exists() and pzspec_dir.is_dir():
-            # Verify it has test files
-            test_files = list(pzspec_dir.glob("test_*.py"))
-            if test_files:
-                return current
 
-        current = current.parent
+def _scandir_zig(path, recursive: bool = True):
+    """
+    Yield .zig files under path using os.scandir.
 
-    return None
+    DirEntry caches the file type from the directory read, so this avoids
+    the extra stat() calls pathlib's glob makes per entry.
+    """
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        yield from _scandir_zig(entry.path)
+                elif entry.name.endswith('.zig') and entry.is_file(follow_symlinks=False):
+                    yield Path(entry.path)
+    except PermissionError:
+        pass
 
 
 def find_zig_sources(project_root: Path) -> list:
     """Find Zig source files in the project."""
     src_dir = project_root / "src"
-    if src_dir.exists():
-        return list(src_dir.glob("**/*.zig"))
-    return list(project_root.glob("*.zig"))
+    if src_dir.is_dir():
+        return list(_scandir_zig(src_dir))
+    # Only look at top-level .zig files in the project root
+    return list(_scandir_zig(project_root, recursive=False))
+
+
+@contextlib.contextmanager
+def _env(key: str, value: str):
+    """Temporarily set an environment variable, restoring the old value on exit."""
+    old = os.environ.get(key)
+    os.environ[key] = value
+    try:
+        yield
+    finally:
+        if old is None:
+            os.environ.pop(key, None)
+        else:
+            os.environ[key] = old
+
+
+def _load_test_module(module_name: str, path) -> None:
+    """Import a test file as a standalone module, registering its tests."""
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
 
 
 def run_tests(
@@ -61,6 +128,7 @@ def run_tests(
     exclude_tags: Optional[List[str]] = None,
     junit_xml: Optional[str] = None,
     check_memory_leaks: bool = False,
+    parallel_load: bool = False,
 ) -> bool:
     """
     Run tests in a PZSpec project.
@@ -78,212 +146,244 @@ def run_tests(
         exclude_tags: Exclude tests with any of these tags.
         junit_xml: Path to generate JUnit XML report.
         check_memory_leaks: Whether to check for memory leaks after each test.
+        parallel_load: Whether to import test files concurrently in a thread pool.
 
     Returns:
         True if all tests passed, False otherwise.
     """
-    # If file_line is provided, extract project root from it
-    if file_line and project_root is None:
+    # Resolve the test file named by file_line once; it's used again when loading
+    file_line_path = None
+    if file_line:
         file_path = file_line.rsplit(':', 1)[0] if ':' in file_line else file_line
-        file_path = Path(file_path).resolve()
-        if file_path.exists():
-            project_root = find_pzspec_dir(file_path.parent)
+        file_line_path = Path(file_path).resolve()
+
+    if project_root is not None:
+        # Only user-supplied roots need resolving; find_pzspec_dir returns real paths
+        project_root = Path(project_root).resolve()
+    else:
+        # If file_line is provided, extract project root from it
+        if file_line_path is not None and file_line_path.exists():
+            project_root = find_pzspec_dir(file_line_path.parent)
 
-    if project_root is None:
-        project_root = find_pzspec_dir()
         if project_root is None:
-            print("Error: No PZSpec project found.", file=sys.stderr)
-            print("  Looked for 'pzspec/' directory with test_*.py files", file=sys.stderr)
-            print("  Run this command from your project root or specify --project-root", file=sys.stderr)
-            return False
+            project_root = find_pzspec_dir()
+            if project_root is None:
+                print("Error: No PZSpec project found.", file=sys.stderr)
+                print("  Looked for 'pzspec/' directory with test_*.py files", file=sys.stderr)
+                print("  Run this command from your project root or specify --project-root", file=sys.stderr)
+                return False
 
-    project_root = Path(project_root).resolve()
     pzspec_dir = project_root / "pzspec"
 
     if not pzspec_dir.exists():
         print(f"Error: pzspec directory not found in {project_root}", file=sys.stderr)
         return False
 
-    # Add project root to Python path
-    sys.path.insert(0, str(project_root))
-
     # Initialize snapshot manager
     from .snapshot import init_snapshot_manager, set_update_snapshots
     init_snapshot_manager(project_root)
     set_update_snapshots(update_snapshots)
 
-    # Coverage instrumentation
-    coverage_builder = None
-    collector = None
-    coverage_lib_path = None
-
-    if coverage:
-        from .coverage import CoverageBuilder, CoverageCollector, CoverageReport
-
-        # Find and instrument Zig sources
-        zig_sources = find_zig_sources(project_root)
-        if not zig_sources:
-            print("Warning: No Zig source files found for coverage", file=sys.stderr)
-        else:
-            coverage_builder = CoverageBuilder(project_root)
-            collector = CoverageCollector()
+    # sys.path/environment changes and coverage cleanup registered here are
+    # undone when run_tests returns, including on early returns and errors
+    with contextlib.ExitStack() as scope:
+        # Make the project root importable for the duration of the run. Skip it
+        # if already present so repeated runs in one process don't grow sys.path.
+        root_str = os.fspath(project_root)
+        if root_str not in sys.path:
+            sys.path.insert(0, root_str)
+            scope.callback(sys.path.remove, root_str)
+
+        # Coverage instrumentation
+        coverage_builder = None
+        collector = None
+        coverage_lib_path = None
+
+        if coverage:
+            from .coverage import CoverageBuilder, CoverageCollector, CoverageReport
+
+            # Find and instrument Zig sources
+            zig_sources = find_zig_sources(project_root)
+            if not zig_sources:
+                print("Warning: No Zig source files found for coverage", file=sys.stderr)
+            else:
+                coverage_builder = CoverageBuilder(project_root)
+                # Remove instrumented files however the run ends
+                scope.callback(coverage_builder.cleanup)
+                collector = CoverageCollector()
 
-            if verbose:
-                print(f"Instrumenting {len(zig_sources)} Zig file(s) for coverage...")
+                if verbose:
+                    print(f"Instrumenting {len(zig_sources)} Zig file(s) for coverage...")
 
-            results = coverage_builder.instrument()
-            for result in results:
-                collector.register_instrumentation(result)
+                results = coverage_builder.instrument()
+                for result in results:
+                    collector.register_instrumentation(result)
 
-            if verbose:
-                total_points = sum(r.counter_count for r in results)
-                print(f"  {total_points} coverage points instrumented")
-
-            # Build the instrumented library
-            if verbose:
-                print("Building instrumented library...")
+                if verbose:
+                    total_points = sum(r.counter_count for r in results)
+                    print(f"  {total_points} coverage points instrumented")
 
-            coverage_lib_path = coverage_builder.build()
-            if coverage_lib_path:
-                # Set environment variable so ZigLibrary uses our instrumented build
-                os.environ['PZSPEC_COVERAGE_LIB'] = str(coverage_lib_path)
+                # Build the instrumented library
                 if verbose:
-                    print(f"  Built: {coverage_lib_path}")
-                    print()
+                    print("Building instrumented library...")
+
+                coverage_lib_path = coverage_builder.build()
+                if coverage_lib_path:
+                    # Set environment variable so ZigLibrary uses our instrumented build
+                    scope.enter_context(_env('PZSPEC_COVERAGE_LIB', os.fspath(coverage_lib_path)))
+                    if verbose:
+                        print(f"  Built: {coverage_lib_path}")
+                        print()
+                else:
+                    print("Warning: Failed to build coverage library", file=sys.stderr)
+                    coverage = False
+
+        # Create test runner
+        from .test_runner import TestRunner
+        from .dsl import set_runner
+
+        runner = TestRunner()
+        set_runner(runner)
+
+        # Import test files
+        # If file_line specifies a specific file, only load that file
+        if file_line_path is not None:
+            if file_line_path.exists() and file_line_path.suffix == '.py':
+                _load_test_module(f"pzspec_{file_line_path.stem}", file_line_path)
             else:
-                print("Warning: Failed to build coverage library", file=sys.stderr)
-                coverage = False
-
-    # Create test runner
-    runner = TestRunner()
-    set_runner(runner)
-
-    # Import test files
-    import importlib.util
-    import pkgutil
-
-    # If file_line specifies a specific file, only load that file
-    if file_line:
-        file_path = file_line.rsplit(':', 1)[0] if ':' in file_line else file_line
-        file_path = Path(file_path).resolve()
-        if file_path.exists() and file_path.suffix == '.py':
-            spec = importlib.util.spec_from_file_location(f"pzspec_{file_path.stem}", file_path)
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
+                print(f"Error: Test file not found: {file_line_path}", file=sys.stderr)
+                return False
         else:
-            print(f"Error: Test file not found: {file_path}", file=sys.stderr)
-            return False
-    else:
-        # Load all test files
-        test_count = 0
-        for _, name, _ in pkgutil.iter_modules([str(pzspec_dir)]):
-            if name != "__init__" and name.startswith("test_"):
-                test_file = pzspec_dir / f"{name}.py"
-                spec = importlib.util.spec_from_file_location(f"pzspec_{name}", test_file)
-                module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(module)
-                test_count += 1
-
-        if test_count == 0:
-            print(f"Warning: No test files found in {pzspec_dir}", file=sys.stderr)
-            return False
-
-    # Initialize memory tracker if requested
-    memory_tracker = None
-    if check_memory_leaks:
-        try:
-            import ctypes
-            from .memory import init_memory_tracker_from_library
-            from .zig_ffi import ZigLibrary
-
-            # Get the library path
-            zig_lib = ZigLibrary()
-            lib = ctypes.CDLL(zig_lib.lib_path)
-            memory_tracker = init_memory_tracker_from_library(lib)
-
-            if memory_tracker.is_available:
-                if verbose:
-                    print("Memory leak detection enabled")
-                    print()
+            # Load all test files (sorted so load order is deterministic)
+            with os.scandir(pzspec_dir) as it:
+                entries = [
+                    entry for entry in it
+                    if entry.name.startswith("test_") and entry.name.endswith(".py")
+                    and entry.is_file()
+                ]
+            entries.sort(key=lambda entry: entry.name)
+
+            if parallel_load and len(entries) > 1:
+                # Overlap I/O done at module level (loading libraries, fixtures).
+                # The runner tracks the describe context per thread, and the
+                # top-level order is restored afterwards for deterministic output.
+                from concurrent.futures import ThreadPoolExecutor
+
+                with ThreadPoolExecutor(max_workers=min(8, len(entries))) as executor:
+                    futures = [
+                        executor.submit(_load_test_module, f"pzspec_{entry.name[:-3]}", entry.path)
+                        for entry in entries
+                    ]
+                    for future in futures:
+                        future.result()  # Re-raise errors from the test file
+                runner.order_by_source_files([entry.path for entry in entries])
             else:
-                print("Warning: Memory tracking not available in Zig library", file=sys.stderr)
-                print("  Add __pzspec_get_allocation_count etc. exports to enable", file=sys.stderr)
-                print()
-        except Exception as e:
-            print(f"Warning: Could not initialize memory tracking: {e}", file=sys.stderr)
-
-    # Run tests
-    success = runner.run(
-        verbose=verbose,
-        file_line=file_line,
-        filter_pattern=filter_pattern,
-        filter_regex=filter_regex,
-        include_tags=include_tags,
-        exclude_tags=exclude_tags,
-    )
-
-    # Generate JUnit XML report if requested
-    if junit_xml:
-        from .junit_report import generate_junit_xml
-        results = runner.get_results()
-        # Determine suite name from project root
-        suite_name = project_root.name if project_root else "pzspec"
-        generate_junit_xml(results, junit_xml, suite_name)
-        if verbose:
-            print(f"JUnit XML report written to: {junit_xml}")
-
-    # Check for memory leaks
-    if memory_tracker and memory_tracker.is_available:
-        from .memory import track_memory, assert_no_leaks
-        leaked_bytes = memory_tracker.get_leaked_bytes()
-        if leaked_bytes > 0:
-            print(f"\nMemory Leak Summary:")
-            print(f"  {leaked_bytes} bytes leaked")
-            print(f"  Run with @check_leaks decorator for per-test tracking")
-            print()
+                for entry in entries:
+                    _load_test_module(f"pzspec_{entry.name[:-3]}", entry.path)
+            test_count = len(entries)
+
+            if test_count == 0:
+                print(f"Warning: No test files found in {pzspec_dir}", file=sys.stderr)
+                return False
+
+        # Initialize memory tracker if requested
+        memory_tracker = None
+        if check_memory_leaks:
+            try:
+                import ctypes
+                from .memory import init_memory_tracker_from_library
+                from .zig_ffi import ZigLibrary
+
+                # Get the library path
+                zig_lib = ZigLibrary()
+                lib = ctypes.CDLL(zig_lib.lib_path)
+                memory_tracker = init_memory_tracker_from_library(lib)
+
+                if memory_tracker.is_available:
+                    if verbose:
+                        print("Memory leak detection enabled")
+                        print()
+                else:
+                    print("Warning: Memory tracking not available in Zig library", file=sys.stderr)
+                    print("  Add __pzspec_get_allocation_count etc. exports to enable", file=sys.stderr)
+                    print()
+            except Exception as e:
+                print(f"Warning: Could not initialize memory tracking: {e}", file=sys.stderr)
+
+        # Compile the -k regex once up front
+        filter_compiled = None
+        if filter_pattern and filter_regex:
+            try:
+                filter_compiled = re.compile(filter_pattern, re.IGNORECASE)
+            except re.error:
+                pass  # The runner warns and falls back to a literal match
+
+        # Run tests
+        success = runner.run(
+            verbose=verbose,
+            file_line=file_line,
+            filter_pattern=filter_pattern,
+            filter_regex=filter_regex,
+            include_tags=include_tags,
+            exclude_tags=exclude_tags,
+            filter_compiled=filter_compiled,
+        )
+
+        # Generate JUnit XML report if requested
+        if junit_xml:
+            from .junit_report import generate_junit_xml
+            results = runner.get_results()
+            # Determine suite name from project root
+            suite_name = project_root.name if project_root else "pzspec"
+            generate_junit_xml(results, junit_xml, suite_name)
             if verbose:
-                success = False
-
-    # Collect and report coverage
-    if coverage and collector and coverage_lib_path:
-        try:
-            import ctypes
+                print(f"JUnit XML report written to: {junit_xml}")
+
+        # Check for memory leaks
+        if memory_tracker and memory_tracker.is_available:
+            from .memory import track_memory, assert_no_leaks
+            leaked_bytes = memory_tracker.get_leaked_bytes()
+            if leaked_bytes > 0:
+                print(f"\nMemory Leak Summary:")
+                print(f"  {leaked_bytes} bytes leaked")
+                print(f"  Run with @check_leaks decorator for per-test tracking")
+                print()
+                if verbose:
+                    success = False
 
-            # Load the coverage library directly
-            coverage_lib = ctypes.CDLL(str(coverage_lib_path))
-            collector.set_library(coverage_lib)
-            collector.collect()
+        # Collect and report coverage
+        if coverage and collector and coverage_lib_path:
+            try:
+                import ctypes
 
-            from .coverage import CoverageReport
-            report = CoverageReport(collector)
+                # Load the coverage library directly
+                coverage_lib = ctypes.CDLL(os.fspath(coverage_lib_path))
+                collector.set_library(coverage_lib)
+                # The reports only need hit/not-hit, so read the bitmap
+                collector.collect(with_counts=False)
 
-            if coverage_html:
-                report.generate_html(coverage_html)
-            else:
-                report.print_summary()
+                from .builder import ZIG_CACHE_DIR
+                from .coverage import CoverageReport
+                report = CoverageReport(collector)
 
-        except Exception as e:
-            print(f"Warning: Could not collect coverage data: {e}", file=sys.stderr)
-            import traceback
-            traceback.print_exc()
+                if coverage_html:
+                    # Keep the page cache out of the published report
+                    report.generate_html(
+                        coverage_html,
+                        cache_dir=project_root / ZIG_CACHE_DIR / "pzspec-html",
+                    )
+                else:
+                    report.print_summary()
 
-        # Cleanup instrumented files
-        if coverage_builder:
-            coverage_builder.cleanup()
+            except Exception as e:
+                print(f"Warning: Could not collect coverage data: {e}", file=sys.stderr)
+                import traceback
+                traceback.print_exc()
 
-        # Clear the environment variable
-        if 'PZSPEC_COVERAGE_LIB' in os.environ:
-            del os.environ['PZSPEC_COVERAGE_LIB']
+        return success
 
-    return success
 
-
-def main():
-    """Main entry point for pzspec command."""
-    parser = argparse.ArgumentParser(
-        description="PZSpec - Python DSL for Testing Zig Code",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
+_EPILOG = """
 Examples:
   # Run all tests in current directory
   pzspec
@@ -327,12 +427,24 @@ Examples:
   # Check for memory leaks
   pzspec --check-leaks
 
+  # Import test files concurrently
+  pzspec --parallel-load
+
   # Run tests in specific project
   pzspec --project-root /path/to/project
 
   # Quiet mode
   pzspec --quiet
         """
+
+
+@functools.lru_cache(maxsize=None)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the pzspec command (constructed once)."""
+    parser = argparse.ArgumentParser(
+        description="PZSpec - Python DSL for Testing Zig Code",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=_EPILOG,
     )
 
     parser.add_argument(
@@ -421,7 +533,24 @@ Examples:
         help="Check for memory leaks (requires Zig-side tracking allocator)",
     )
 
-    args = parser.parse_args()
+    parser.add_argument(
+        "--parallel-load",
+        action="store_true",
+        help="Import test files concurrently (useful when test files do slow setup at import)",
+    )
+
+    parser.add_argument(
+        "--version",
+        action="version",
+        version=f"pzspec {__version__}",
+    )
+
+    return parser
+
+
+def main():
+    """Main entry point for pzspec command."""
+    args = _build_parser().parse_args()
 
     verbose = args.verbose and not args.quiet
     project_root = Path(args.project_root) if args.project_root else None
@@ -451,6 +580,7 @@ Examples:
         exclude_tags=exclude_tags,
         junit_xml=args.junit_xml,
         check_memory_leaks=args.check_leaks,
+        parallel_load=args.parallel_load,
     )
     sys.exit(0 if success else 1)
 
@@ -4,14 +4,94 @@ Coverage-aware builder for Zig libraries.
 This module handles building Zig libraries from instrumented source code.
 """
 
+import dataclasses
+import hashlib
+import json
 import os
 import subprocess
-import platform
 import shutil
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, List
+from typing import Any, Dict, Optional, List, Tuple
 
+from ..builder import ZIG_CACHE_DIR, _LIB_EXT, _first_zig_file
+from . import instrumenter, parser
 from .instrumenter import ZigInstrumenter, InstrumentationResult
+from .parser import CoveragePoint, CoveragePointType, ParseResult, ZigBranch, ZigFunction
+
+
+# Instrumented copies of unchanged sources are reused between runs. They and
+# the manifest (source (mtime_ns, size) and instrumentation result per file)
+# live under the Zig cache directory, since cleanup() removes the coverage
+# directory after every run.
+_CACHE_SUBDIR = "pzspec-instrumented"
+_MANIFEST_NAME = "manifest.json"
+
+# Instrument in worker processes only when there are at least this many files
+_PARALLEL_MIN_FILES = 4
+
+
+@lru_cache(maxsize=None)
+def _instrumenter_version() -> str:
+    """
+    Hash of the instrumenter and parser sources (which include the coverage
+    runtime template), so a pzspec upgrade doesn't reuse stale copies.
+    """
+    digest = hashlib.sha256()
+    for module in (instrumenter, parser):
+        try:
+            with open(module.__file__, 'rb') as f:
+                digest.update(f.read())
+        except (OSError, TypeError):
+            # No source available; fall back to the module name alone
+            digest.update(module.__name__.encode())
+    return digest.hexdigest()
+
+
+def _result_to_json(result: InstrumentationResult) -> Dict[str, Any]:
+    """The parts of an InstrumentationResult not derived from its paths."""
+    def convert(value):
+        if isinstance(value, CoveragePointType):
+            return value.value
+        raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+    # asdict() keeps enum members, so round-trip through json to convert them
+    return json.loads(json.dumps(dataclasses.asdict(result.parse_result), default=convert))
+
+
+def _result_from_json(
+    data: Dict[str, Any], original_path: str, instrumented_path: str
+) -> InstrumentationResult:
+    """Rebuild an InstrumentationResult saved by _result_to_json()."""
+    coverage_points = [
+        CoveragePoint(**{**point, 'type': CoveragePointType(point['type'])})
+        for point in data['coverage_points']
+    ]
+    parse_result = ParseResult(
+        file_path=data['file_path'],
+        functions=[ZigFunction(**function) for function in data['functions']],
+        branches=[
+            ZigBranch(**{**branch, 'type': CoveragePointType(branch['type'])})
+            for branch in data['branches']
+        ],
+        coverage_points=coverage_points,
+        total_lines=data['total_lines'],
+        executable_lines=data['executable_lines'],
+    )
+    # The instrumenter returns the parse result's own point list
+    return InstrumentationResult(
+        original_path=original_path,
+        instrumented_path=instrumented_path,
+        parse_result=parse_result,
+        coverage_points=coverage_points,
+        counter_count=len(coverage_points),
+    )
+
+
+def _instrument_file(task: Tuple[str, str]) -> InstrumentationResult:
+    """Instrument one (source_path, output_dir) pair; runs in a worker process."""
+    source_file, output_dir = task
+    return ZigInstrumenter(output_dir=output_dir).instrument_file(source_file)
 
 
 class CoverageBuilder:
@@ -27,26 +107,26 @@ class CoverageBuilder:
     def __init__(self, project_root: Path):
         self.project_root = Path(project_root).resolve()
         self.coverage_dir = self.project_root / ".pzspec-coverage"
+        self.cache_dir = self.project_root / ZIG_CACHE_DIR / _CACHE_SUBDIR
         self.instrumenter = ZigInstrumenter(output_dir=str(self.coverage_dir))
         self.instrumentation_results: List[InstrumentationResult] = []
         self._library_path: Optional[Path] = None
 
     def _get_library_extension(self) -> str:
         """Get the library extension for the current platform."""
-        system = platform.system()
-        if system == "Darwin":
-            return ".dylib"
-        elif system == "Linux":
-            return ".so"
-        elif system == "Windows":
-            return ".dll"
-        return ".so"
+        return _LIB_EXT
 
     def find_source_files(self) -> List[Path]:
         """Find Zig source files in the project."""
         src_dir = self.project_root / "src"
         if src_dir.exists():
-            return list(src_dir.glob("**/*.zig"))
+            # os.walk avoids pathlib glob's per-entry overhead and lets us
+            # prune instrumented copies instead of filtering them afterwards
+            sources = []
+            for root, dirs, files in os.walk(src_dir, followlinks=False):
+                dirs[:] = [d for d in dirs if d != self.coverage_dir.name]
+                sources.extend(Path(root, f) for f in files if f.endswith(".zig"))
+            return sources
 
         # Also check for .zig files in project root
         return list(self.project_root.glob("*.zig"))
@@ -61,20 +141,106 @@ class CoverageBuilder:
         # Create coverage directory
         self.coverage_dir.mkdir(parents=True, exist_ok=True)
 
-        # Copy directory structure and instrument files
+        # Results from a previous run, reused for sources that haven't changed
+        manifest = self._load_manifest()
+        new_manifest = {}
+        stamps = {}
+
+        # Copy directory structure and collect the files to instrument
+        results: List[Optional[InstrumentationResult]] = []
+        tasks = []  # (index into results, (source_path, output_dir))
         for source_file in source_files:
+            key = str(source_file)
+            st = source_file.stat()
+            stamps[key] = stamp = [st.st_mtime_ns, st.st_size]
+
             # Preserve relative path structure
             rel_path = source_file.relative_to(self.project_root)
             output_dir = self.coverage_dir / rel_path.parent
             output_dir.mkdir(parents=True, exist_ok=True)
-
-            # Instrument the file
-            self.instrumenter.output_dir = str(output_dir)
-            result = self.instrumenter.instrument_file(str(source_file))
-            self.instrumentation_results.append(result)
+            output_path = self.coverage_dir / rel_path
+
+            cached = manifest.get(key)
+            if cached is not None:
+                try:
+                    if cached['stamp'] != stamp:
+                        raise ValueError("source changed")
+                    result = _result_from_json(cached['result'], key, str(output_path))
+                    shutil.copyfile(self.cache_dir / rel_path, output_path)
+                except (OSError, KeyError, TypeError, ValueError):
+                    pass  # Stale, missing or unreadable entry: instrument again
+                else:
+                    self.instrumenter.results[key] = result
+                    new_manifest[key] = cached
+                    results.append(result)
+                    continue
+
+            tasks.append((len(results), (key, str(output_dir))))
+            results.append(None)
+
+        if len(tasks) < _PARALLEL_MIN_FILES:
+            # Too few files to pay for starting worker processes
+            for index, (source_file, output_dir) in tasks:
+                self.instrumenter.output_dir = output_dir
+                results[index] = self.instrumenter.instrument_file(source_file)
+        else:
+            # Files are independent and parsing is CPU-bound Python, so
+            # instrument them in separate processes to sidestep the GIL
+            from concurrent.futures import ProcessPoolExecutor
+
+            workers = min(len(tasks), os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                fresh = executor.map(_instrument_file, [task for _, task in tasks])
+                for (index, _), result in zip(tasks, fresh):
+                    results[index] = result
+                    self.instrumenter.results[result.original_path] = result
+
+        for index, (source_file, _) in tasks:
+            result = results[index]
+            rel_path = Path(source_file).relative_to(self.project_root)
+            try:
+                cached_copy = self.cache_dir / rel_path
+                cached_copy.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(result.instrumented_path, cached_copy)
+            except OSError:
+                continue  # Leave it out of the cache
+            new_manifest[source_file] = {
+                'stamp': stamps[source_file],
+                'result': _result_to_json(result),
+            }
+        self._save_manifest(new_manifest)
+
+        self.instrumentation_results.extend(results)
 
         return self.instrumentation_results
 
+    def _load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Load cached instrumentation entries keyed by source path.
+
+        Returns an empty manifest if there is none, it can't be read, or it
+        was written by a different version of the instrumenter.
+        """
+        try:
+            with open(self.cache_dir / _MANIFEST_NAME, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(manifest, dict) or manifest.get('version') != _instrumenter_version():
+            return {}
+        files = manifest.get('files')
+        return files if isinstance(files, dict) else {}
+
+    def _save_manifest(self, files: Dict[str, Dict[str, Any]]):
+        """Save each source's (mtime_ns, size) and instrumentation result."""
+        manifest = {'version': _instrumenter_version(), 'files': files}
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_dir / _MANIFEST_NAME, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f)
+        except OSError:
+            pass  # The cache is an optimization only
+
     def build(self, library_name: Optional[str] = None) -> Optional[Path]:
         """
         Build the instrumented library.
@@ -97,27 +263,21 @@ class CoverageBuilder:
         output_path = self.coverage_dir / lib_filename
 
         # Find the main source file in coverage directory
-        # Prefer lib.zig or the first .zig file
+        # Prefer lib.zig or the first .zig file by name (same rule as ZigBuilder)
         coverage_src = self.coverage_dir / "src"
         if coverage_src.exists():
             lib_zig = coverage_src / "lib.zig"
             if lib_zig.exists():
                 main_source = lib_zig
             else:
-                zig_files = list(coverage_src.glob("*.zig"))
-                if zig_files:
-                    main_source = zig_files[0]
-                else:
-                    print("No Zig source found in coverage directory")
-                    return None
+                main_source = _first_zig_file(coverage_src)
         else:
             # Check for files directly in coverage dir
-            zig_files = list(self.coverage_dir.glob("*.zig"))
-            if zig_files:
-                main_source = zig_files[0]
-            else:
-                print("No Zig source found in coverage directory")
-                return None
+            main_source = _first_zig_file(self.coverage_dir)
+
+        if main_source is None:
+            print("No Zig source found in coverage directory")
+            return None
 
         # Build command
         cmd = [
@@ -127,18 +287,23 @@ class CoverageBuilder:
             "-fPIC",
             str(main_source),
             "--name", f"{library_name}_coverage",
+            # The coverage dir is removed by cleanup(), so keep the cache in
+            # the project root. Instrumentation is deterministic, so unchanged
+            # sources hit the cache instead of recompiling from scratch.
+            "--cache-dir", str(self.project_root / ZIG_CACHE_DIR),
         ]
 
         try:
             result = subprocess.run(
                 cmd,
-                cwd=str(self.coverage_dir),
-                capture_output=True,
-                text=True,
+                cwd=self.coverage_dir,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
             )
 
             if result.returncode != 0:
-                print(f"Build failed: {result.stderr}")
+                stderr = result.stderr.decode('utf-8', errors='replace')
+                print(f"Build failed: {stderr}")
                 return None
 
             # Find the built library
@@ -170,7 +335,11 @@ class CoverageBuilder:
         return self._library_path
 
     def cleanup(self):
-        """Remove all coverage files and directories."""
+        """
+        Remove all coverage files and directories.
+
+        The instrumentation cache under the Zig cache directory is kept.
+        """
         if self.coverage_dir.exists():
             shutil.rmtree(self.coverage_dir)
 
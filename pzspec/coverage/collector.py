@@ -3,20 +3,79 @@ Coverage data collector for reading coverage counters from instrumented Zig code
 """
 
 import ctypes
-from dataclasses import dataclass, field
+from array import array
+from dataclasses import InitVar, dataclass, field
+from itertools import compress
+from operator import not_
 from pathlib import Path
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional
 
-from .parser import CoveragePoint, CoveragePointType
+from .._compat import DATACLASS_SLOTS
+from .parser import CoveragePoint, CoveragePointType, BRANCH_TYPES
 from .instrumenter import InstrumentationResult
 
 
-@dataclass
+# Maps the ASCII digits of a binary string to 0/1 byte values
+_BIT_CHARS = bytes.maketrans(b'01', b'\x00\x01')
+
+
+class _InitVarProperty(property):
+    """
+    A read-only property that reads as None on the class, so it can share
+    its name with a dataclass InitVar, which takes its default from there.
+    """
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return None
+        return super().__get__(obj, objtype)
+
+
+@dataclass(**DATACLASS_SLOTS)
 class CoverageData:
     """Coverage data for a single file."""
     file_path: str
     coverage_points: List[CoveragePoint]
-    hit_counts: Dict[int, int] = field(default_factory=dict)
+    # Hit count per coverage point, in the same order as coverage_points.
+    # Point IDs are dense per file, so a flat unsigned array replaces a dict.
+    hits: array = field(default_factory=lambda: array('Q'))
+    # Point types in the same order, so counts run as C-level list.count()
+    types: List[CoveragePointType] = field(init=False, repr=False)
+    # Point line numbers in the same order, for the line reports
+    lines: array = field(init=False, repr=False)
+
+    def _hit_counts(self) -> Mapping[int, int]:
+        """
+        Hit counts keyed by coverage point ID, as a read-only view built
+        from hits. Update hits to change them.
+        """
+        return MappingProxyType({
+            point.id: hits for point, hits in zip(self.coverage_points, self.hits)
+        })
+
+    # Hit counts keyed by coverage point ID, as the constructor took before
+    # hits existed. Still accepted (by keyword, or as a mapping in place of
+    # hits) and converted to hits; reading it gives _hit_counts().
+    hit_counts: InitVar[Optional[Mapping[int, int]]] = _InitVarProperty(_hit_counts)
+
+    def __post_init__(self, hit_counts: Optional[Mapping[int, int]]):
+        if hit_counts is None and isinstance(self.hits, Mapping):
+            hit_counts = self.hits
+        if hit_counts is not None:
+            self.hits = array('Q', [
+                hit_counts.get(point.id, 0) for point in self.coverage_points
+            ])
+        elif not isinstance(self.hits, array):
+            self.hits = array('Q', self.hits)
+        if len(self.hits) < len(self.coverage_points):
+            self.hits.extend([0] * (len(self.coverage_points) - len(self.hits)))
+        self.types = [point.type for point in self.coverage_points]
+        self.lines = array('L', [point.line for point in self.coverage_points])
+
+    def _covered_types(self) -> List[CoveragePointType]:
+        """Types of the coverage points that were hit."""
+        return list(compress(self.types, self.hits))
 
     @property
     def total_points(self) -> int:
@@ -26,7 +85,7 @@ class CoverageData:
     @property
     def covered_points(self) -> int:
         """Number of coverage points that were hit."""
-        return sum(1 for count in self.hit_counts.values() if count > 0)
+        return len(self.hits) - self.hits.count(0)
 
     @property
     def coverage_percent(self) -> float:
@@ -38,68 +97,38 @@ class CoverageData:
     @property
     def functions_covered(self) -> int:
         """Number of functions that were called."""
-        return sum(
-            1 for point in self.coverage_points
-            if point.type == CoveragePointType.FUNCTION_ENTRY
-            and self.hit_counts.get(point.id, 0) > 0
-        )
+        return self._covered_types().count(CoveragePointType.FUNCTION_ENTRY)
 
     @property
     def total_functions(self) -> int:
         """Total number of functions."""
-        return sum(
-            1 for point in self.coverage_points
-            if point.type == CoveragePointType.FUNCTION_ENTRY
-        )
+        return self.types.count(CoveragePointType.FUNCTION_ENTRY)
 
     @property
     def branches_covered(self) -> int:
         """Number of branches that were taken."""
-        branch_types = {
-            CoveragePointType.BRANCH_IF,
-            CoveragePointType.BRANCH_ELSE,
-            CoveragePointType.BRANCH_SWITCH,
-        }
-        return sum(
-            1 for point in self.coverage_points
-            if point.type in branch_types
-            and self.hit_counts.get(point.id, 0) > 0
-        )
+        covered = self._covered_types()
+        return sum(covered.count(t) for t in BRANCH_TYPES)
 
     @property
     def total_branches(self) -> int:
         """Total number of branches."""
-        branch_types = {
-            CoveragePointType.BRANCH_IF,
-            CoveragePointType.BRANCH_ELSE,
-            CoveragePointType.BRANCH_SWITCH,
-        }
-        return sum(
-            1 for point in self.coverage_points
-            if point.type in branch_types
-        )
+        return sum(self.types.count(t) for t in BRANCH_TYPES)
 
     def get_uncovered_functions(self) -> List[CoveragePoint]:
         """Get list of functions that were not called."""
         return [
-            point for point in self.coverage_points
+            point for point in compress(self.coverage_points, map(not_, self.hits))
             if point.type == CoveragePointType.FUNCTION_ENTRY
-            and self.hit_counts.get(point.id, 0) == 0
         ]
 
     def get_covered_lines(self) -> List[int]:
         """Get list of lines that were covered."""
-        return sorted(set(
-            point.line for point in self.coverage_points
-            if self.hit_counts.get(point.id, 0) > 0
-        ))
+        return sorted(set(compress(self.lines, self.hits)))
 
     def get_uncovered_lines(self) -> List[int]:
         """Get list of lines that were not covered."""
-        return sorted(set(
-            point.line for point in self.coverage_points
-            if self.hit_counts.get(point.id, 0) == 0
-        ))
+        return sorted(set(compress(self.lines, map(not_, self.hits))))
 
 
 class CoverageCollector:
@@ -114,6 +143,8 @@ class CoverageCollector:
         self.instrumentation_results: Dict[str, InstrumentationResult] = {}
         self.coverage_data: Dict[str, CoverageData] = {}
         self._library: Optional[ctypes.CDLL] = None
+        # Summary of the last collect(), computed on first use
+        self._summary: Optional[Dict] = None
 
     def register_instrumentation(self, result: InstrumentationResult):
         """Register an instrumentation result for later collection."""
@@ -123,10 +154,17 @@ class CoverageCollector:
         """Set the loaded Zig library to collect coverage from."""
         self._library = library
 
-    def collect(self) -> Dict[str, CoverageData]:
+    def collect(self, with_counts: bool = True) -> Dict[str, CoverageData]:
         """
         Collect coverage data from the instrumented library.
 
+        Args:
+            with_counts: Read the full hit counters (the default). If False,
+                only the hit bitmap is read when the library exports it, and
+                each point's hit count is 1 if it ran and 0 otherwise; that
+                is enough for the coverage reports, which only need to know
+                whether each point was hit.
+
         Returns:
             Dictionary mapping file paths to their coverage data
         """
@@ -157,24 +195,76 @@ class CoverageCollector:
                 all_points.append((file_path, point))
 
         # Collect counter values
-        counter_values = {}
-        for i in range(min(total_counters, len(all_points))):
-            counter_values[i] = get_counter(i)
+        num_counters = min(total_counters, len(all_points))
+        values = None if with_counts else self._read_hit_bits(num_counters)
+        if values is None:
+            values = self._read_counters(get_counter, num_counters)
+        num_values = len(values)
 
         # Build coverage data per file
         self.coverage_data = {}
+        self._summary = None
         for file_path, result in self.instrumentation_results.items():
-            data = CoverageData(
+            self.coverage_data[file_path] = CoverageData(
                 file_path=file_path,
                 coverage_points=list(result.coverage_points),  # Ensure it's a list
+                hits=array('Q', [
+                    values[point.id] if point.id < num_values else 0
+                    for point in result.coverage_points
+                ]),
             )
 
-            for point in result.coverage_points:
-                data.hit_counts[point.id] = counter_values.get(point.id, 0)
+        return self.coverage_data
+
+    def _read_counters(self, get_counter, count: int) -> List[int]:
+        """
+        Read the first count coverage counters.
 
-            self.coverage_data[file_path] = data
+        Copies the whole counter array in one read through the exported data
+        pointer, falling back to one FFI call per counter for libraries built
+        before __pzspec_coverage_data_ptr existed.
+        """
+        if count <= 0:
+            return []
 
-        return self.coverage_data
+        try:
+            data_ptr = getattr(self._library, '__pzspec_coverage_data_ptr')
+        except AttributeError:
+            return [get_counter(i) for i in range(count)]
+
+        data_ptr.argtypes = []
+        data_ptr.restype = ctypes.c_void_p
+        address = data_ptr()
+        if not address:
+            return [get_counter(i) for i in range(count)]
+
+        return list((ctypes.c_uint64 * count).from_address(address))
+
+    def _read_hit_bits(self, count: int) -> Optional[List[int]]:
+        """
+        Read whether each of the first count points was hit, as 0 or 1.
+
+        Returns None if the library doesn't export the hit bitmap.
+        """
+        if count <= 0:
+            return []
+
+        try:
+            bits_ptr = getattr(self._library, '__pzspec_coverage_hit_bits_ptr')
+        except AttributeError:
+            return None
+
+        bits_ptr.argtypes = []
+        bits_ptr.restype = ctypes.c_void_p
+        address = bits_ptr()
+        if not address:
+            return None
+
+        # Bit i of the bitmap is bit i of the little-endian integer; format it
+        # as a binary string (lowest bit first) and map '0'/'1' to 0/1 bytes
+        raw = ctypes.string_at(address, (count + 7) // 8)
+        bits = format(int.from_bytes(raw, 'little'), f'0{len(raw) * 8}b')[::-1]
+        return list(bits[:count].encode('ascii').translate(_BIT_CHARS))
 
     def reset(self):
         """Reset coverage counters in the library."""
@@ -208,14 +298,25 @@ class CoverageCollector:
                 'covered_branches': 0,
             }
 
-        total_points = sum(d.total_points for d in self.coverage_data.values())
-        covered_points = sum(d.covered_points for d in self.coverage_data.values())
-        total_functions = sum(d.total_functions for d in self.coverage_data.values())
-        covered_functions = sum(d.functions_covered for d in self.coverage_data.values())
-        total_branches = sum(d.total_branches for d in self.coverage_data.values())
-        covered_branches = sum(d.branches_covered for d in self.coverage_data.values())
-
-        return {
+        if self._summary is not None:
+            return dict(self._summary)
+
+        # One pass over all files' points instead of six per-file sums
+        all_hits = array('Q')
+        all_types: List[CoveragePointType] = []
+        for data in self.coverage_data.values():
+            all_hits.extend(data.hits)
+            all_types.extend(data.types)
+        covered_types = list(compress(all_types, all_hits))
+
+        total_points = len(all_hits)
+        covered_points = total_points - all_hits.count(0)
+        total_functions = all_types.count(CoveragePointType.FUNCTION_ENTRY)
+        covered_functions = covered_types.count(CoveragePointType.FUNCTION_ENTRY)
+        total_branches = sum(all_types.count(t) for t in BRANCH_TYPES)
+        covered_branches = sum(covered_types.count(t) for t in BRANCH_TYPES)
+
+        self._summary = {
             'total_files': len(self.coverage_data),
             'total_points': total_points,
             'covered_points': covered_points,
@@ -227,3 +328,4 @@ class CoverageCollector:
             'covered_branches': covered_branches,
             'branch_coverage_percent': (covered_branches / total_branches * 100) if total_branches > 0 else 0.0,
         }
+        return dict(self._summary)
@@ -12,10 +12,19 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
-from .parser import ZigParser, ParseResult, CoveragePoint, CoveragePointType
+from .parser import (
+    ZigParser, ParseResult, CoveragePoint, CoveragePointType, BRANCH_TYPES,
+)
+from .._compat import DATACLASS_SLOTS
 
 
-@dataclass
+# Instrumenters share one parser, so its caches (parse results and previous
+# sources for incremental reparsing, both keyed by file path and bounded to
+# ZigParser.CACHE_SIZE files) carry over between instrumenters
+_DEFAULT_PARSER = ZigParser()
+
+
+@dataclass(**DATACLASS_SLOTS)
 class InstrumentationResult:
     """Result of instrumenting a Zig source file."""
     original_path: str
@@ -35,48 +44,77 @@ class ZigInstrumenter:
     3. Insert counter increment calls at coverage points
     """
 
-    # Template for the coverage runtime that gets added to instrumented files
+    # Template for the coverage runtime that gets added to instrumented files.
+    # __COUNT__ is replaced with the number of counters; a plain sentinel keeps
+    # the Zig braces unescaped and avoids running the format parser.
     COVERAGE_RUNTIME = '''
 // PZSpec Coverage Runtime
 // This code is automatically generated - do not edit
 
-var __pzspec_coverage_counters: [{count}]u64 = [_]u64{{0}} ** {count};
+var __pzspec_coverage_counters: [__COUNT__]u64 = [_]u64{0} ** __COUNT__;
+// One bit per counter, set on first hit, for cheap "was it executed?" reads
+var __pzspec_coverage_hit_bits: [(__COUNT__ + 7) / 8]u8 = [_]u8{0} ** ((__COUNT__ + 7) / 8);
 var __pzspec_coverage_initialized: bool = false;
 
-export fn __pzspec_coverage_get_counter(index: u32) u64 {{
-    if (index >= {count}) return 0;
-    return __pzspec_coverage_counters[index];
-}}
-
-export fn __pzspec_coverage_get_count() u32 {{
-    return {count};
-}}
-
-export fn __pzspec_coverage_reset() void {{
-    for (&__pzspec_coverage_counters) |*counter| {{
-        counter.* = 0;
-    }}
-}}
-
-inline fn __pzspec_cov(comptime index: u32) void {{
-    if (index < {count}) {{
-        __pzspec_coverage_counters[index] += 1;
-    }}
-}}
+// Counters are updated atomically so multi-threaded code doesn't lose hits.
+// AtomicOrder's fields were renamed to lowercase in Zig 0.12.
+const __pzspec_coverage_order: @import("std").builtin.AtomicOrder =
+    if (@hasField(@import("std").builtin.AtomicOrder, "monotonic")) .monotonic else .Monotonic;
+
+export fn __pzspec_coverage_get_counter(index: u32) u64 {
+    if (index >= __COUNT__) return 0;
+    return @atomicLoad(u64, &__pzspec_coverage_counters[index], __pzspec_coverage_order);
+}
+
+export fn __pzspec_coverage_data_ptr() [*]const u64 {
+    return &__pzspec_coverage_counters;
+}
+
+export fn __pzspec_coverage_hit_bits_ptr() [*]const u8 {
+    return &__pzspec_coverage_hit_bits;
+}
+
+export fn __pzspec_coverage_get_count() u32 {
+    return __COUNT__;
+}
+
+export fn __pzspec_coverage_reset() void {
+    for (&__pzspec_coverage_counters) |*counter| {
+        @atomicStore(u64, counter, 0, __pzspec_coverage_order);
+    }
+    for (&__pzspec_coverage_hit_bits) |*bits| {
+        @atomicStore(u8, bits, 0, __pzspec_coverage_order);
+    }
+}
+
+inline fn __pzspec_cov(comptime index: u32) void {
+    // Indices are assigned at instrumentation time, so check them at compile time
+    comptime {
+        if (index >= __COUNT__) @compileError("pzspec coverage counter index out of range");
+    }
+    _ = @atomicRmw(u8, &__pzspec_coverage_hit_bits[index / 8], .Or, @as(u8, 1) << (index % 8), __pzspec_coverage_order);
+    _ = @atomicRmw(u64, &__pzspec_coverage_counters[index], .Add, 1, __pzspec_coverage_order);
+}
 
 // End PZSpec Coverage Runtime
 
 '''
 
-    def __init__(self, output_dir: Optional[str] = None):
+    _NEWLINE_PATTERN = re.compile(r'\n')
+    _IF_PATTERN = ZigParser.IF_PATTERN
+
+    def __init__(
+        self, output_dir: Optional[str] = None, parser: Optional[ZigParser] = None
+    ):
         """
         Initialize the instrumenter.
 
         Args:
             output_dir: Directory to write instrumented files.
                        If None, creates a .pzspec-coverage directory.
+            parser: Parser to use. Defaults to a shared module-level ZigParser.
         """
-        self.parser = ZigParser()
+        self.parser = parser or _DEFAULT_PARSER
         self.output_dir = output_dir
         self.results: Dict[str, InstrumentationResult] = {}
 
@@ -165,101 +203,107 @@ inline fn __pzspec_cov(comptime index: u32) void {{
             # No coverage points found, return original
             return source, []
 
-        lines = source.split('\n')
-
         # Assign IDs to coverage points
         for i, point in enumerate(coverage_points):
             point.id = i
 
-        # Group coverage points by line for efficient insertion
-        points_by_line: Dict[int, List[CoveragePoint]] = {}
+        # Start offset of every line, so insertions are computed against the
+        # original source and spliced in with a single join
+        line_starts = [0]
+        line_starts.extend(
+            m.end() for m in self._NEWLINE_PATTERN.finditer(source)
+        )
+
+        # One insertion per line: the point with the lowest column wins
+        # (the last such point on ties)
+        point_for_line: Dict[int, CoveragePoint] = {}
         for point in coverage_points:
-            if point.line not in points_by_line:
-                points_by_line[point.line] = []
-            points_by_line[point.line].append(point)
+            current = point_for_line.get(point.line)
+            if current is None or point.column <= current.column:
+                point_for_line[point.line] = point
 
-        # Insert coverage calls (work backwards to preserve line numbers)
-        for line_num in sorted(points_by_line.keys(), reverse=True):
-            points = points_by_line[line_num]
+        insertions: List[Tuple[int, str]] = []
+        for line_num, point in point_for_line.items():
             line_idx = line_num - 1
-
-            if line_idx >= len(lines):
+            if line_idx >= len(line_starts):
                 continue
 
-            line = lines[line_idx]
-
-            for point in sorted(points, key=lambda p: p.column, reverse=True):
-                if point.type == CoveragePointType.FUNCTION_ENTRY:
-                    # Insert coverage call at the start of function body
-                    # Find the opening brace and insert after it
-                    lines[line_idx] = self._insert_function_coverage(
-                        line, point.id
-                    )
-                elif point.type in (
-                    CoveragePointType.BRANCH_IF,
-                    CoveragePointType.BRANCH_ELSE,
-                    CoveragePointType.BRANCH_SWITCH,
-                ):
-                    # Insert coverage call before the branch
-                    lines[line_idx] = self._insert_branch_coverage(
-                        line, point.column, point.id
-                    )
+            line_start = line_starts[line_idx]
+            if line_idx + 1 < len(line_starts):
+                line_end = line_starts[line_idx + 1] - 1
+            else:
+                line_end = len(source)
+            line = source[line_start:line_end]
+
+            if point.type == CoveragePointType.FUNCTION_ENTRY:
+                # Insert coverage call at the start of function body
+                insertion = self._function_coverage_insertion(line, point.id)
+            elif point.type in BRANCH_TYPES:
+                # Insert coverage call before the branch
+                insertion = self._branch_coverage_insertion(line, point.id)
+            else:
+                insertion = None
+
+            if insertion is not None:
+                insertions.append((line_start + insertion[0], insertion[1]))
 
         # Add coverage runtime at the top (after imports)
-        runtime = self.COVERAGE_RUNTIME.format(count=len(coverage_points))
-        instrumented_lines = self._insert_runtime(lines, runtime)
-
-        return '\n'.join(instrumented_lines), coverage_points
-
-    def _insert_runtime(self, lines: List[str], runtime: str) -> List[str]:
-        """Insert the coverage runtime after imports."""
+        runtime = self.COVERAGE_RUNTIME.replace('__COUNT__', str(len(coverage_points)))
+        insertions.append(self._runtime_insertion(source, line_starts, runtime))
+
+        # Splice every insertion into the original source in one pass
+        insertions.sort(key=lambda insertion: insertion[0])
+        parts = []
+        last = 0
+        for offset, text in insertions:
+            parts.append(source[last:offset])
+            parts.append(text)
+            last = offset
+        parts.append(source[last:])
+
+        return ''.join(parts), coverage_points
+
+    def _runtime_insertion(
+        self, source: str, line_starts: List[int], runtime: str
+    ) -> Tuple[int, str]:
+        """Get the (offset, text) inserting the coverage runtime after imports."""
         # Find the last import line
-        last_import = -1
-        for i, line in enumerate(lines):
-            if '@import' in line:
-                last_import = i
-
-        # Insert runtime after imports
-        insert_pos = last_import + 1 if last_import >= 0 else 0
-
-        result = lines[:insert_pos]
-        result.append('')
-        result.extend(runtime.split('\n'))
-        result.extend(lines[insert_pos:])
+        last_import = source.rfind('@import')
+        if last_import == -1:
+            insert_line = 0
+        else:
+            insert_line = source.count('\n', 0, last_import) + 1
 
-        return result
+        # Insert runtime on its own lines, after a blank line
+        if insert_line < len(line_starts):
+            return line_starts[insert_line], '\n' + runtime + '\n'
+        return len(source), '\n\n' + runtime
 
-    def _insert_function_coverage(self, line: str, point_id: int) -> str:
-        """Insert coverage call at function entry."""
+    def _function_coverage_insertion(
+        self, line: str, point_id: int
+    ) -> Optional[Tuple[int, str]]:
+        """Get the (column, text) of the coverage call at function entry."""
         # Find the opening brace
         brace_pos = line.find('{')
         if brace_pos == -1:
-            return line
+            return None
 
         # Insert coverage call after the brace
-        call = f' __pzspec_cov({point_id});'
-        return line[:brace_pos + 1] + call + line[brace_pos + 1:]
-
-    def _insert_branch_coverage(
-        self, line: str, column: int, point_id: int
-    ) -> str:
-        """Insert coverage call before a branch."""
-        # For branches, we wrap the condition
-        # This is tricky - for now, we'll add a block before
-        indent = len(line) - len(line.lstrip())
-        indent_str = ' ' * indent
+        return brace_pos + 1, f' __pzspec_cov({point_id});'
 
+    def _branch_coverage_insertion(
+        self, line: str, point_id: int
+    ) -> Optional[Tuple[int, str]]:
+        """Get the (column, text) of the coverage call before a branch."""
         # Simple approach: add coverage call on the same line before the branch
         # This works for simple cases
         if 'if (' in line or 'if(' in line:
             # Insert before the if
-            match = re.search(r'\bif\s*\(', line)
+            match = self._IF_PATTERN.search(line)
             if match:
-                pos = match.start()
-                call = f'{{ __pzspec_cov({point_id}); }} '
-                return line[:pos] + call + line[pos:]
+                return match.start(), f'{{ __pzspec_cov({point_id}); }} '
 
-        return line
+        return None
 
     def get_coverage_points(self) -> Dict[str, List[CoveragePoint]]:
         """Get all coverage points organized by file."""
@@ -8,9 +8,14 @@ This is a lightweight parser that identifies:
 """
 
 import re
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 from enum import Enum
+from itertools import accumulate
+
+from .._compat import DATACLASS_SLOTS
 
 
 class CoveragePointType(Enum):
@@ -22,7 +27,15 @@ class CoveragePointType(Enum):
     LINE = "line"
 
 
-@dataclass
+# Coverage point types counted as branches
+BRANCH_TYPES = frozenset({
+    CoveragePointType.BRANCH_IF,
+    CoveragePointType.BRANCH_ELSE,
+    CoveragePointType.BRANCH_SWITCH,
+})
+
+
+@dataclass(**DATACLASS_SLOTS)
 class CoveragePoint:
     """A point in the source code that can be covered."""
     type: CoveragePointType
@@ -33,7 +46,7 @@ class CoveragePoint:
     id: int = 0  # Assigned during instrumentation
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ZigFunction:
     """Represents a Zig function."""
     name: str
@@ -45,7 +58,7 @@ class ZigFunction:
     body_end: int  # Line where body ends (})
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ZigBranch:
     """Represents a branch point in Zig code."""
     type: CoveragePointType
@@ -54,7 +67,7 @@ class ZigBranch:
     parent_function: str
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ParseResult:
     """Result of parsing a Zig source file."""
     file_path: str
@@ -65,6 +78,30 @@ class ParseResult:
     executable_lines: List[int] = field(default_factory=list)
 
 
+def _common_prefix_length(a: str, b: str) -> int:
+    """Length of the common prefix of a and b (binary search over slices)."""
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _common_suffix_length(a: str, b: str, limit: int) -> int:
+    """Length of the common suffix of a and b, at most limit."""
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[len(a) - mid:] == b[len(b) - mid:]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
 class ZigParser:
     """
     Parser for Zig source code to identify coverage instrumentation points.
@@ -84,56 +121,180 @@ class ZigParser:
     SWITCH_PATTERN = re.compile(r'\bswitch\s*\(')
     RETURN_PATTERN = re.compile(r'\breturn\b')
 
-    # Lines that are not executable
-    NON_EXECUTABLE_PATTERNS = [
-        re.compile(r'^\s*$'),  # Empty lines
-        re.compile(r'^\s*//'),  # Comments
-        re.compile(r'^\s*\*'),  # Multi-line comment continuation
-        re.compile(r'^\s*/\*'),  # Multi-line comment start
-        re.compile(r'^\s*\*/'),  # Multi-line comment end
-        re.compile(r'^\s*const\s+\w+\s*=\s*@import'),  # Import statements
-        re.compile(r'^\s*pub\s+const\s+\w+\s*=\s*\w+;'),  # Type aliases
-        re.compile(r'^\s*\};?\s*$'),  # Closing braces only
-        re.compile(r'^\s*\{\s*$'),  # Opening braces only
-    ]
+    # All branch patterns fused so the source is scanned once; the group name
+    # tells which kind of branch matched. Whitespace excludes newlines so a
+    # match never spans lines.
+    BRANCH_PATTERN = re.compile(
+        r'(?P<if>\bif[^\S\n]*\()'
+        r'|(?P<else>\}[^\S\n]*else[^\S\n]*[\{])'
+        r'|(?P<switch>\bswitch[^\S\n]*\()'
+    )
+    NEWLINE_PATTERN = re.compile(r'\n')
+    # Braces, plus the literals and comments whose braces must not count.
+    # Non-brace tokens are matched only to be skipped as a whole.
+    BRACE_PATTERN = re.compile(
+        r'[{}]'
+        r'|//[^\n]*'  # Line comments
+        r'|/\*.*?(?:\*/|\Z)'  # Block comments
+        r'|\\\\[^\n]*'  # Multiline string literal lines (\\)
+        r'|"(?:\\.|[^"\\\n])*"?'  # String literals
+        r"|'(?:\\.|[^'\\\n])*'?",  # Character literals
+        re.DOTALL
+    )
+    BRANCH_GROUP_TYPES = {
+        'if': CoveragePointType.BRANCH_IF,
+        'else': CoveragePointType.BRANCH_ELSE,
+        'switch': CoveragePointType.BRANCH_SWITCH,
+    }
+
+    # Lines that are not executable, as one anchored alternation. Whitespace
+    # excludes newlines so the whole source can be scanned in one pass.
+    NON_EXECUTABLE_PATTERN = re.compile(
+        r'^[^\S\n]*(?:'
+        r'$'  # Empty lines
+        r'|//'  # Comments
+        r'|\*'  # Multi-line comment continuation (and end)
+        r'|/\*'  # Multi-line comment start
+        r'|const[^\S\n]+\w+[^\S\n]*=[^\S\n]*@import'  # Import statements
+        r'|pub[^\S\n]+const[^\S\n]+\w+[^\S\n]*=[^\S\n]*\w+;'  # Type aliases
+        r'|\};?[^\S\n]*$'  # Closing braces only
+        r'|\{[^\S\n]*$'  # Opening braces only
+        r'|pub const[^\n]*= (?:extern struct|struct|enum)'  # Struct/enum declarations
+        r')',
+        re.MULTILINE
+    )
+
+    # Number of recent parse results kept for unchanged sources, and of files
+    # whose previous source is kept for incremental reparsing
+    CACHE_SIZE = 64
 
     def __init__(self):
-        self.current_function: Optional[str] = None
-        self.brace_depth = 0
+        self._cache: "OrderedDict[Tuple[str, str], ParseResult]" = OrderedDict()
+        # Last parsed source per file and its function bodies (opening brace
+        # offset -> closing offset), so a reparse can skip brace matching for
+        # functions an edit didn't touch. Bounded like _cache.
+        self._previous: "OrderedDict[str, Tuple[str, Dict[int, int]]]" = OrderedDict()
 
     def parse(self, source: str, file_path: str) -> ParseResult:
-        """Parse Zig source code and identify coverage points."""
-        result = ParseResult(file_path=file_path)
-        lines = source.split('\n')
-        result.total_lines = len(lines)
+        """
+        Parse Zig source code and identify coverage points.
+
+        Results are cached per (file_path, source), so parsing an unchanged
+        file again returns the same ParseResult object; treat it as read-only.
+        """
+        key = (file_path, source)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+
+        result = self._parse(source, file_path)
+
+        self._cache[key] = result
+        if len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return result
 
-        # First pass: find all functions
-        self._find_functions(source, result)
+    def _parse(self, source: str, file_path: str) -> ParseResult:
+        """Parse source without consulting the cache."""
+        result = ParseResult(file_path=file_path)
+        # Line start offsets, computed once and shared by every pass
+        line_starts = self._line_starts(source)
+        result.total_lines = len(line_starts)
+
+        # First pass: find all functions, reusing body extents from the
+        # previous version of this file where the edit can't affect them
+        previous = self._previous.get(file_path)
+        known_body_end = self._body_lookup(*previous, source) if previous else None
+        bodies: Dict[int, int] = {}
+        self._find_functions(source, line_starts, result, known_body_end, bodies)
+        self._previous[file_path] = (source, bodies)
+        self._previous.move_to_end(file_path)
+        if len(self._previous) > self.CACHE_SIZE:
+            self._previous.popitem(last=False)
 
         # Second pass: find branches and executable lines
-        self._find_branches_and_lines(lines, result)
+        self._find_branches_and_lines(source, line_starts, result)
 
         # Generate coverage points
         self._generate_coverage_points(result)
 
         return result
 
-    def _find_functions(self, source: str, result: ParseResult):
-        """Find all function definitions in the source."""
+    def _body_lookup(
+        self, old_source: str, old_bodies: Dict[int, int], source: str
+    ) -> Callable[[int], Optional[int]]:
+        """
+        Build a lookup from a body's opening brace offset to its closing
+        offset, valid for bodies that lie entirely in the text shared with
+        the previous version of the file.
+
+        Brace matching only reads forward from the opening brace, so a body
+        closing before the first changed character keeps its offsets, and a
+        body opening inside the unchanged tail keeps them shifted by the
+        change in length.
+        """
+        prefix = _common_prefix_length(old_source, source)
+        suffix = _common_suffix_length(
+            old_source, source, min(len(old_source), len(source)) - prefix
+        )
+        delta = len(source) - len(old_source)
+        suffix_start = len(source) - suffix
+
+        def known_body_end(brace_pos: int) -> Optional[int]:
+            if brace_pos >= suffix_start:
+                end = old_bodies.get(brace_pos - delta)
+                return None if end is None else end + delta
+            end = old_bodies.get(brace_pos)
+            # Strictly inside the prefix, which also excludes bodies that
+            # were cut off by the end of the old source
+            if end is not None and end + 1 < prefix:
+                return end
+            return None
+
+        return known_body_end
+
+    def _line_starts(self, source: str) -> List[int]:
+        """Offsets at which each line of source starts."""
+        line_starts = [0]
+        line_starts.extend(m.end() for m in self.NEWLINE_PATTERN.finditer(source))
+        return line_starts
+
+    def _find_functions(
+        self,
+        source: str,
+        line_starts: List[int],
+        result: ParseResult,
+        known_body_end: Optional[Callable[[int], Optional[int]]] = None,
+        bodies: Optional[Dict[int, int]] = None,
+    ):
+        """
+        Find all function definitions in the source.
+
+        Args:
+            known_body_end: Optional lookup of already known body extents
+            bodies: Optional dict filled with each body's brace offsets
+        """
         for match in self.FUNCTION_PATTERN.finditer(source):
             indent = match.group(1)
             is_public = match.group(2) is not None
             is_export = match.group(3) is not None
             name = match.group(4)
 
-            # Calculate line number
-            line = source[:match.start()].count('\n') + 1
+            # Calculate line number (bisect over line starts instead of
+            # counting newlines in a slice up to the match)
+            line = bisect_right(line_starts, match.start())
             column = len(indent)
 
             # Find the body extent
-            body_start, body_end = self._find_function_body(source, match.end() - 1)
-            body_start_line = source[:body_start].count('\n') + 1
-            body_end_line = source[:body_end].count('\n') + 1
+            body_start = match.end() - 1
+            body_end = known_body_end(body_start) if known_body_end else None
+            if body_end is None:
+                body_start, body_end = self._find_function_body(source, body_start)
+            if bodies is not None:
+                bodies[body_start] = body_end
+            body_start_line = bisect_right(line_starts, body_start)
+            body_end_line = bisect_right(line_starts, body_end)
 
             func = ZigFunction(
                 name=name,
@@ -149,85 +310,81 @@ class ZigParser:
     def _find_function_body(self, source: str, brace_pos: int) -> Tuple[int, int]:
         """Find the start and end positions of a function body."""
         depth = 1
-        pos = brace_pos + 1
         start = brace_pos
 
-        while pos < len(source) and depth > 0:
-            char = source[pos]
-            if char == '{':
+        # Jump from token to token; the regex engine skips everything else,
+        # and braces inside literals and comments match as part of those
+        for match in self.BRACE_PATTERN.finditer(source, brace_pos + 1):
+            token = match.group()
+            if token == '{':
                 depth += 1
-            elif char == '}':
+            elif token == '}':
                 depth -= 1
-            pos += 1
+                if depth == 0:
+                    return start, match.start()
 
-        return start, pos - 1
+        # Unbalanced: the body runs to the end of the source
+        return start, len(source) - 1
 
-    def _find_branches_and_lines(self, lines: List[str], result: ParseResult):
+    def _find_branches_and_lines(
+        self, source: str, line_starts: List[int], result: ParseResult
+    ):
         """Find branch points and executable lines."""
-        current_function = None
-
-        for i, line in enumerate(lines):
-            line_num = i + 1
-
-            # Check if this is an executable line
-            if self._is_executable_line(line):
-                result.executable_lines.append(line_num)
-
-            # Track current function context
-            for func in result.functions:
-                if func.body_start <= line_num <= func.body_end:
-                    current_function = func.name
-                    break
-
-            # Find branch points
+        # Every line is executable except those the pattern matches (each
+        # match starts at its line's first character)
+        line_index = {start: i for i, start in enumerate(line_starts)}
+        non_executable = {
+            line_index[m.start()]
+            for m in self.NON_EXECUTABLE_PATTERN.finditer(source)
+        }
+        result.executable_lines.extend(
+            i + 1 for i in range(len(line_starts)) if i not in non_executable
+        )
+
+        # Interval index over function bodies. Functions are found in source
+        # order, so body starts are sorted; max_ends[i] is the latest body end
+        # among functions[:i + 1]
+        functions = result.functions
+        starts = [func.body_start for func in functions]
+        max_ends = list(accumulate((func.body_end for func in functions), max))
+
+        # Find branch points with one pass over the whole source
+        for match in self.BRANCH_PATTERN.finditer(source):
+            line_idx = bisect_right(line_starts, match.start()) - 1
+            line_num = line_idx + 1
+
+            current_function = self._function_at(functions, starts, max_ends, line_num)
             if current_function:
-                # Check for if statements
-                for match in self.IF_PATTERN.finditer(line):
-                    result.branches.append(ZigBranch(
-                        type=CoveragePointType.BRANCH_IF,
-                        line=line_num,
-                        column=match.start(),
-                        parent_function=current_function,
-                    ))
-
-                # Check for else clauses
-                for match in self.ELSE_PATTERN.finditer(line):
-                    result.branches.append(ZigBranch(
-                        type=CoveragePointType.BRANCH_ELSE,
-                        line=line_num,
-                        column=match.start(),
-                        parent_function=current_function,
-                    ))
-
-                # Check for switch statements
-                for match in self.SWITCH_PATTERN.finditer(line):
-                    result.branches.append(ZigBranch(
-                        type=CoveragePointType.BRANCH_SWITCH,
-                        line=line_num,
-                        column=match.start(),
-                        parent_function=current_function,
-                    ))
-
-    def _is_executable_line(self, line: str) -> bool:
-        """Check if a line is executable code."""
-        for pattern in self.NON_EXECUTABLE_PATTERNS:
-            if pattern.match(line):
-                return False
-
-        # Additional check: line must have some content
-        stripped = line.strip()
-        if not stripped:
-            return False
-
-        # Skip struct/enum declarations (they're not executable)
-        if stripped.startswith('pub const') and '= extern struct' in stripped:
-            return False
-        if stripped.startswith('pub const') and '= struct' in stripped:
-            return False
-        if stripped.startswith('pub const') and '= enum' in stripped:
-            return False
-
-        return True
+                result.branches.append(ZigBranch(
+                    type=self.BRANCH_GROUP_TYPES[match.lastgroup],
+                    line=line_num,
+                    column=match.start() - line_starts[line_idx],
+                    parent_function=current_function,
+                ))
+
+    def _function_at(
+        self,
+        functions: List[ZigFunction],
+        starts: List[int],
+        max_ends: List[int],
+        line_num: int,
+    ) -> Optional[str]:
+        """
+        Get the name of the function a line belongs to.
+
+        That is the first function whose body contains the line. Lines between
+        functions belong to the function of the closest body line above them;
+        lines before any function body belong to none.
+        """
+        # Functions starting at or before the line
+        idx = bisect_right(starts, line_num) - 1
+        if idx < 0:
+            return None
+
+        # The first function reaching the line contains it; if none reaches
+        # it, look up the last body line above it instead
+        target = min(line_num, max_ends[idx])
+        return functions[bisect_left(max_ends, target, 0, idx + 1)].name
 
     def _generate_coverage_points(self, result: ParseResult):
         """Generate coverage points from parsed data."""
@@ -2,18 +2,166 @@
 Coverage report generation for PZSpec.
 """
 
+import hashlib
 import os
+from functools import lru_cache
+from html import escape
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional
+from string import Template
+from typing import Dict, List, Optional, Tuple
 
 from .collector import CoverageData, CoverageCollector
 from .parser import CoveragePointType
 
 
+# Buffer size for streaming HTML pages to disk
+_WRITE_BUFFER = 1 << 20
+
+# Render per-file pages in worker processes only when there are at least this many files
+_PARALLEL_MIN_FILES = 4
+
+# CSS classes indexed by coverage decile (0-10): low below 50%, medium
+# below 80%, high from 80%
+_PROGRESS_CLASSES = ('progress-low',) * 5 + ('progress-medium',) * 3 + ('progress-high',) * 3
+_TEXT_CLASSES = ('coverage-low',) * 5 + ('coverage-medium',) * 3 + ('coverage-high',) * 3
+
+
+@lru_cache(maxsize=None)
+def _renderer_version() -> str:
+    """
+    Hash of this module's source, so a pzspec upgrade that changes the page
+    markup re-renders pages instead of keeping their old format.
+    """
+    try:
+        with open(__file__, 'rb') as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    except OSError:
+        return __name__
+
+
+def _coverage_decile(percent: float) -> int:
+    """Index into the class tables for a coverage percentage."""
+    return min(max(int(percent) // 10, 0), 10)
+
+
+# Page templates, compiled once at import. string.Template uses $-placeholders,
+# so the embedded CSS braces need no escaping. Per-line rows stay f-strings,
+# which are several times faster than Template.substitute in the hot loop.
+_INDEX_HEADER = Template('''<!DOCTYPE html>
+<html>
+<head>
+    <title>PZSpec Coverage Report</title>
+    <style>
+        body { font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif; margin: 40px; }
+        h1 { color: #333; }
+        table { border-collapse: collapse; width: 100%; max-width: 800px; }
+        th, td { border: 1px solid #ddd; padding: 12px; text-align: left; }
+        th { background-color: #4CAF50; color: white; }
+        tr:nth-child(even) { background-color: #f2f2f2; }
+        .coverage-high { color: #2e7d32; font-weight: bold; }
+        .coverage-medium { color: #f9a825; font-weight: bold; }
+        .coverage-low { color: #c62828; font-weight: bold; }
+        .summary { background-color: #e8f5e9; padding: 20px; border-radius: 8px; margin-bottom: 20px; }
+        .progress { background-color: #e0e0e0; border-radius: 4px; overflow: hidden; }
+        .progress-bar { height: 20px; transition: width 0.3s; }
+        .progress-high { background-color: #4CAF50; }
+        .progress-medium { background-color: #FFC107; }
+        .progress-low { background-color: #F44336; }
+    </style>
+</head>
+<body>
+    <h1>PZSpec Coverage Report</h1>
+
+    <div class="summary">
+        <h2>Summary</h2>
+        <p><strong>Total Coverage:</strong> $coverage_percent%</p>
+        <div class="progress">
+            <div class="progress-bar $progress_class"
+                 style="width: $coverage_percent%"></div>
+        </div>
+        <p><strong>Functions:</strong> $covered_functions/$total_functions
+           ($function_coverage_percent%)</p>
+        <p><strong>Branches:</strong> $covered_branches/$total_branches
+           ($branch_coverage_percent%)</p>
+    </div>
+
+    <h2>Files</h2>
+    <table>
+        <tr>
+            <th>File</th>
+            <th>Coverage</th>
+            <th>Points</th>
+            <th>Functions</th>
+            <th>Branches</th>
+        </tr>
+''')
+
+_INDEX_FOOTER = '''    </table>
+
+    <footer style="margin-top: 40px; color: #666;">
+        Generated by PZSpec Coverage
+    </footer>
+</body>
+</html>
+'''
+
+_FILE_HEADER = Template('''<!DOCTYPE html>
+<html>
+<head>
+    <title>Coverage: $filename</title>
+    <style>
+        body { font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif; margin: 40px; }
+        h1 { color: #333; }
+        .source { font-family: "SF Mono", Monaco, monospace; font-size: 14px; }
+        .line { display: flex; }
+        .line-number { width: 50px; text-align: right; padding-right: 10px; color: #999; user-select: none; }
+        .line-content { flex: 1; padding-left: 10px; white-space: pre; }
+        .covered { background-color: #c8e6c9; }
+        .uncovered { background-color: #ffcdd2; }
+        .summary { background-color: #e8f5e9; padding: 20px; border-radius: 8px; margin-bottom: 20px; }
+        a { color: #1976D2; }
+    </style>
+</head>
+<body>
+    <p><a href="index.html">&larr; Back to Index</a></p>
+    <h1>$filename</h1>
+
+    <div class="summary">
+        <p><strong>Coverage:</strong> $coverage_percent%
+           ($covered_points/$total_points points)</p>
+        <p><strong>Functions:</strong> $functions_covered/$total_functions</p>
+        <p><strong>Branches:</strong> $branches_covered/$total_branches</p>
+    </div>
+
+    <h2>Source</h2>
+    <div class="source">
+''')
+
+_FILE_FOOTER = '''    </div>
+</body>
+</html>
+'''
+
+
+def _render_html_file(task: Tuple[str, str, str, CoverageData]):
+    """
+    Render one (output_dir, key_dir, file_path, data) HTML page; runs in a
+    worker process.
+    """
+    output_dir, key_dir, file_path, data = task
+    CoverageReport(CoverageCollector())._generate_html_file(
+        Path(output_dir), Path(key_dir), file_path, data
+    )
+
+
 class CoverageReport:
     """Generates coverage reports in various formats."""
 
+    # Default directory, inside the HTML output, recording what each page was
+    # built from
+    HTML_CACHE_DIR = '.cache'
+
     def __init__(self, collector: CoverageCollector):
         self.collector = collector
 
@@ -81,17 +229,46 @@ class CoverageReport:
             if not uncovered_funcs and not uncovered_lines:
                 print("  All code covered!")
 
-    def generate_html(self, output_dir: str):
-        """Generate HTML coverage report."""
+    def generate_html(self, output_dir: str, cache_dir: Optional[str] = None):
+        """
+        Generate HTML coverage report.
+
+        Args:
+            output_dir: Directory to write the report to
+            cache_dir: Directory for the records of what each page was
+                generated from, which let unchanged pages be skipped on the
+                next run. Defaults to a .cache directory inside output_dir.
+        """
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
+        if cache_dir is None:
+            key_dir = output_path / self.HTML_CACHE_DIR
+        else:
+            # One subdirectory per report, so reports don't share records
+            report_id = hashlib.sha1(str(output_path.resolve()).encode()).hexdigest()
+            key_dir = Path(cache_dir) / report_id[:16]
 
         # Generate index page
         self._generate_html_index(output_path)
 
         # Generate per-file pages
-        for file_path, data in self.collector.coverage_data.items():
-            self._generate_html_file(output_path, file_path, data)
+        files = list(self.collector.coverage_data.items())
+        if len(files) < _PARALLEL_MIN_FILES:
+            # Too few files to pay for starting worker processes
+            for file_path, data in files:
+                self._generate_html_file(output_path, key_dir, file_path, data)
+        else:
+            # Pages are independent and escaping/formatting is CPU-bound
+            # Python, so render them in separate processes to sidestep the GIL
+            from concurrent.futures import ProcessPoolExecutor
+
+            workers = min(len(files), os.cpu_count() or 1)
+            tasks = [
+                (str(output_path), str(key_dir), file_path, data)
+                for file_path, data in files
+            ]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(_render_html_file, tasks))
 
         print(f"HTML coverage report generated in: {output_path}")
 
@@ -99,86 +276,73 @@ class CoverageReport:
         """Generate the index HTML page."""
         summary = self.collector.get_summary()
 
-        html = f'''<!DOCTYPE html>
-<html>
-<head>
-    <title>PZSpec Coverage Report</title>
-    <style>
-        body {{ font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif; margin: 40px; }}
-        h1 {{ color: #333; }}
-        table {{ border-collapse: collapse; width: 100%; max-width: 800px; }}
-        th, td {{ border: 1px solid #ddd; padding: 12px; text-align: left; }}
-        th {{ background-color: #4CAF50; color: white; }}
-        tr:nth-child(even) {{ background-color: #f2f2f2; }}
-        .coverage-high {{ color: #2e7d32; font-weight: bold; }}
-        .coverage-medium {{ color: #f9a825; font-weight: bold; }}
-        .coverage-low {{ color: #c62828; font-weight: bold; }}
-        .summary {{ background-color: #e8f5e9; padding: 20px; border-radius: 8px; margin-bottom: 20px; }}
-        .progress {{ background-color: #e0e0e0; border-radius: 4px; overflow: hidden; }}
-        .progress-bar {{ height: 20px; transition: width 0.3s; }}
-        .progress-high {{ background-color: #4CAF50; }}
-        .progress-medium {{ background-color: #FFC107; }}
-        .progress-low {{ background-color: #F44336; }}
-    </style>
-</head>
-<body>
-    <h1>PZSpec Coverage Report</h1>
-
-    <div class="summary">
-        <h2>Summary</h2>
-        <p><strong>Total Coverage:</strong> {summary['coverage_percent']:.1f}%</p>
-        <div class="progress">
-            <div class="progress-bar {self._get_coverage_class(summary['coverage_percent'])}"
-                 style="width: {summary['coverage_percent']:.1f}%"></div>
-        </div>
-        <p><strong>Functions:</strong> {summary['covered_functions']}/{summary['total_functions']}
-           ({summary['function_coverage_percent']:.1f}%)</p>
-        <p><strong>Branches:</strong> {summary['covered_branches']}/{summary['total_branches']}
-           ({summary['branch_coverage_percent']:.1f}%)</p>
-    </div>
-
-    <h2>Files</h2>
-    <table>
-        <tr>
-            <th>File</th>
-            <th>Coverage</th>
-            <th>Points</th>
-            <th>Functions</th>
-            <th>Branches</th>
-        </tr>
-'''
+        # Stream the page to disk piece by piece instead of building it in memory
+        with open(output_path / 'index.html', 'w', buffering=_WRITE_BUFFER) as f:
+            self._write_html_index(f, summary)
+
+    def _write_html_index(self, f, summary: Dict):
+        """Write the index HTML page to an open file."""
+        f.write(_INDEX_HEADER.substitute(
+            coverage_percent=f"{summary['coverage_percent']:.1f}",
+            progress_class=self._get_coverage_class(summary['coverage_percent']),
+            covered_functions=summary['covered_functions'],
+            total_functions=summary['total_functions'],
+            function_coverage_percent=f"{summary['function_coverage_percent']:.1f}",
+            covered_branches=summary['covered_branches'],
+            total_branches=summary['total_branches'],
+            branch_coverage_percent=f"{summary['branch_coverage_percent']:.1f}",
+        ))
 
         for file_path, data in self.collector.coverage_data.items():
             filename = os.path.basename(file_path)
             safe_filename = filename.replace('.', '_') + '.html'
             coverage_class = self._get_coverage_text_class(data.coverage_percent)
 
-            html += f'''        <tr>
+            f.write(f'''        <tr>
             <td><a href="{safe_filename}">{filename}</a></td>
             <td class="{coverage_class}">{data.coverage_percent:.1f}%</td>
             <td>{data.covered_points}/{data.total_points}</td>
             <td>{data.functions_covered}/{data.total_functions}</td>
             <td>{data.branches_covered}/{data.total_branches}</td>
         </tr>
-'''
-
-        html += '''    </table>
-
-    <footer style="margin-top: 40px; color: #666;">
-        Generated by PZSpec Coverage
-    </footer>
-</body>
-</html>
-'''
+''')
 
-        with open(output_path / 'index.html', 'w') as f:
-            f.write(html)
+        f.write(_INDEX_FOOTER)
 
-    def _generate_html_file(self, output_path: Path, file_path: str, data: CoverageData):
-        """Generate HTML page for a single file."""
+    def _generate_html_file(
+        self, output_path: Path, key_dir: Path, file_path: str, data: CoverageData
+    ):
+        """
+        Generate HTML page for a single file, recording what it was generated
+        from in key_dir.
+        """
         filename = os.path.basename(file_path)
         safe_filename = filename.replace('.', '_') + '.html'
 
+        covered = data.get_covered_lines()
+        uncovered = data.get_uncovered_lines()
+
+        # Skip rendering if the page on disk was generated by the same
+        # renderer from the same source file and the same coverage results
+        try:
+            st = os.stat(file_path)
+            source_stamp = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            source_stamp = None
+        cache_key = hashlib.sha1(repr((
+            _renderer_version(), file_path, source_stamp, covered, uncovered,
+            data.covered_points, data.total_points,
+            data.functions_covered, data.total_functions,
+            data.branches_covered, data.total_branches,
+        )).encode()).hexdigest()
+        key_path = key_dir / (safe_filename + '.key')
+        page_path = output_path / safe_filename
+        try:
+            if key_path.read_text() == cache_key and page_path.exists():
+                return
+        except OSError:
+            pass
+
         # Read the original source file
         try:
             with open(file_path, 'r') as f:
@@ -186,44 +350,48 @@ class CoverageReport:
         except FileNotFoundError:
             source_lines = ["// Source file not found"]
 
-        covered_lines = set(data.get_covered_lines())
-        uncovered_lines = set(data.get_uncovered_lines())
+        # Stream the page to disk piece by piece instead of building it in memory
+        with open(page_path, 'w', buffering=_WRITE_BUFFER) as f:
+            self._write_html_file(f, filename, data, source_lines, covered, uncovered)
 
-        html = f'''<!DOCTYPE html>
-<html>
-<head>
-    <title>Coverage: {filename}</title>
-    <style>
-        body {{ font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif; margin: 40px; }}
-        h1 {{ color: #333; }}
-        .source {{ font-family: "SF Mono", Monaco, monospace; font-size: 14px; }}
-        .line {{ display: flex; }}
-        .line-number {{ width: 50px; text-align: right; padding-right: 10px; color: #999; user-select: none; }}
-        .line-content {{ flex: 1; padding-left: 10px; white-space: pre; }}
-        .covered {{ background-color: #c8e6c9; }}
-        .uncovered {{ background-color: #ffcdd2; }}
-        .summary {{ background-color: #e8f5e9; padding: 20px; border-radius: 8px; margin-bottom: 20px; }}
-        a {{ color: #1976D2; }}
-    </style>
-</head>
-<body>
-    <p><a href="index.html">&larr; Back to Index</a></p>
-    <h1>{filename}</h1>
-
-    <div class="summary">
-        <p><strong>Coverage:</strong> {data.coverage_percent:.1f}%
-           ({data.covered_points}/{data.total_points} points)</p>
-        <p><strong>Functions:</strong> {data.functions_covered}/{data.total_functions}</p>
-        <p><strong>Branches:</strong> {data.branches_covered}/{data.total_branches}</p>
-    </div>
-
-    <h2>Source</h2>
-    <div class="source">
-'''
-
-        for i, line in enumerate(source_lines):
+        # Record what the page was generated from
+        try:
+            key_path.parent.mkdir(parents=True, exist_ok=True)
+            key_path.write_text(cache_key)
+        except OSError:
+            pass  # The cache is an optimization only
+
+    def _write_html_file(
+        self,
+        f,
+        filename: str,
+        data: CoverageData,
+        source_lines: List[str],
+        covered: List[int],
+        uncovered: List[int],
+    ):
+        """Write the HTML page for a single file to an open file."""
+        covered_lines = set(covered)
+        uncovered_lines = set(uncovered)
+
+        f.write(_FILE_HEADER.substitute(
+            filename=filename,
+            coverage_percent=f"{data.coverage_percent:.1f}",
+            covered_points=data.covered_points,
+            total_points=data.total_points,
+            functions_covered=data.functions_covered,
+            total_functions=data.total_functions,
+            branches_covered=data.branches_covered,
+            total_branches=data.total_branches,
+        ))
+
+        # Escape the whole source in one pass, then split it back into lines
+        escaped_lines = escape(''.join(source_lines), quote=False).split('\n')
+        if len(escaped_lines) > len(source_lines):
+            escaped_lines.pop()  # Empty string after the final newline
+
+        for i, line_content in enumerate(escaped_lines):
             line_num = i + 1
-            line_content = line.rstrip('\n')
 
             if line_num in covered_lines:
                 line_class = 'covered'
@@ -232,41 +400,21 @@ class CoverageReport:
             else:
                 line_class = ''
 
-            # Escape HTML
-            line_content = (line_content
-                          .replace('&', '&amp;')
-                          .replace('<', '&lt;')
-                          .replace('>', '&gt;'))
-
-            html += f'''        <div class="line {line_class}">
+            f.write(f'''        <div class="line {line_class}">
             <span class="line-number">{line_num}</span>
             <span class="line-content">{line_content}</span>
         </div>
-'''
-
-        html += '''    </div>
-</body>
-</html>
-'''
+''')
 
-        with open(output_path / safe_filename, 'w') as f:
-            f.write(html)
+        f.write(_FILE_FOOTER)
 
     def _get_coverage_class(self, percent: float) -> str:
         """Get CSS class for progress bar based on coverage percentage."""
-        if percent >= 80:
-            return 'progress-high'
-        elif percent >= 50:
-            return 'progress-medium'
-        return 'progress-low'
+        return _PROGRESS_CLASSES[_coverage_decile(percent)]
 
     def _get_coverage_text_class(self, percent: float) -> str:
         """Get CSS class for text based on coverage percentage."""
-        if percent >= 80:
-            return 'coverage-high'
-        elif percent >= 50:
-            return 'coverage-medium'
-        return 'coverage-low'
+        return _TEXT_CLASSES[_coverage_decile(percent)]
 
     def to_json(self) -> Dict:
         """Export coverage data as JSON-serializable dict."""
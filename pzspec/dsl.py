@@ -2,25 +2,23 @@
 Domain-Specific Language for writing tests in a readable, expressive way.
 """
 
-from typing import Any, Callable, Optional, List
+from typing import Any, Callable, Optional, List, Sequence
 from .test_runner import TestRunner, TestSuite
 
 
-# Global test runner instance
-_runner: Optional[TestRunner] = None
+# Global test runner instance. Created up front (it's cheap) so it is never
+# None; the DSL functions below read it directly instead of calling get_runner().
+_runner: TestRunner = TestRunner()
 
 
-def set_runner(runner: TestRunner):
-    """Set the global test runner instance."""
+def set_runner(runner: Optional[TestRunner]):
+    """Set the global test runner instance (None starts a fresh one)."""
     global _runner
-    _runner = runner
+    _runner = runner if runner is not None else TestRunner()
 
 
 def get_runner() -> TestRunner:
     """Get the global test runner instance."""
-    global _runner
-    if _runner is None:
-        _runner = TestRunner()
     return _runner
 
 
@@ -38,7 +36,7 @@ def describe(name: str, tags: Optional[List[str]] = None):
             def test_slow():
                 ...
     """
-    return get_runner().describe(name, tags=tags)
+    return _runner.describe(name, tags=tags)
 
 
 def it(name: str, tags: Optional[List[str]] = None):
@@ -56,7 +54,7 @@ def it(name: str, tags: Optional[List[str]] = None):
             ...
     """
     def decorator(func: Callable):
-        get_runner().add_test(name, func, tags=tags)
+        _runner.add_test(name, func, tags=tags)
         return func
     return decorator
 
@@ -68,7 +66,7 @@ class it_skip:
         self.name = name
 
     def __call__(self, func: Callable):
-        get_runner().add_test(self.name, func, tags=["skip"])
+        _runner.add_test(self.name, func, tags=["skip"])
         return func
 
 
@@ -78,7 +76,7 @@ class it_slow:
         self.name = name
 
     def __call__(self, func: Callable):
-        get_runner().add_test(self.name, func, tags=["slow"])
+        _runner.add_test(self.name, func, tags=["slow"])
         return func
 
 
@@ -88,7 +86,7 @@ class it_focus:
         self.name = name
 
     def __call__(self, func: Callable):
-        get_runner().add_test(self.name, func, tags=["focus"])
+        _runner.add_test(self.name, func, tags=["focus"])
         return func
 
 
@@ -101,11 +99,11 @@ def test(name: str, func: Optional[Callable] = None):
     """
     if func is None:
         def decorator(f: Callable):
-            get_runner().add_test(name, f)
+            _runner.add_test(name, f)
             return f
         return decorator
     else:
-        get_runner().add_test(name, func)
+        _runner.add_test(name, func)
 
 
 def before_all(func: Callable):
@@ -118,7 +116,7 @@ def before_all(func: Callable):
             def setup_db():
                 db.connect()
     """
-    return get_runner().before_all(func)
+    return _runner.before_all(func)
 
 
 def after_all(func: Callable):
@@ -131,7 +129,7 @@ def after_all(func: Callable):
             def teardown_db():
                 db.disconnect()
     """
-    return get_runner().after_all(func)
+    return _runner.after_all(func)
 
 
 def before_each(func: Callable):
@@ -145,7 +143,7 @@ def before_each(func: Callable):
             def setup_user():
                 user = User.create()
     """
-    return get_runner().before_each(func)
+    return _runner.before_each(func)
 
 
 def after_each(func: Callable):
@@ -159,7 +157,7 @@ def after_each(func: Callable):
             def cleanup():
                 User.delete_all()
     """
-    return get_runner().after_each(func)
+    return _runner.after_each(func)
 
 
 # Aliases for convenience
@@ -173,41 +171,70 @@ def after(func: Callable):
     return after_each(func)
 
 
+# snapshot.get_snapshot_manager, bound on the first to_match_snapshot() call
+# so importing the DSL doesn't load the snapshot module
+_get_snapshot_manager: Optional[Callable] = None
+
+# Longest value rendering kept in an assertion failure message
+_MAX_VALUE_LENGTH = 1000
+
+
+def _format_value(value: Any) -> str:
+    """str(value) for a failure message, truncated if it is very long."""
+    text = str(value)
+    if len(text) <= _MAX_VALUE_LENGTH:
+        return text
+    return f"{text[:_MAX_VALUE_LENGTH]}... ({len(text)} characters)"
+
+
 class Expectation:
     """Expectation object for fluent assertions."""
+
+    # Created for every expect() call, so skip the per-instance __dict__
+    __slots__ = ('actual',)
     
     def __init__(self, actual: Any):
         self.actual = actual
     
     def to_equal(self, expected: Any, msg: Optional[str] = None):
         """Assert that actual equals expected."""
-        if self.actual != expected:
-            error_msg = msg or f"Expected {expected}, but got {self.actual}"
-            raise AssertionError(error_msg)
+        actual = self.actual
+        # Identity first, as container comparisons do; the message is only
+        # formatted on failure
+        if actual is expected or actual == expected:
+            return
+        raise AssertionError(
+            msg or f"Expected {_format_value(expected)}, but got {_format_value(actual)}"
+        )
     
     def to_not_equal(self, expected: Any, msg: Optional[str] = None):
         """Assert that actual does not equal expected."""
-        if self.actual == expected:
-            error_msg = msg or f"Expected not {expected}, but got {self.actual}"
-            raise AssertionError(error_msg)
+        actual = self.actual
+        # The exact opposite of to_equal, identity included
+        if actual is expected or actual == expected:
+            raise AssertionError(
+                msg or f"Expected not {_format_value(expected)}, but got {_format_value(actual)}"
+            )
     
     def to_be_true(self, msg: Optional[str] = None):
         """Assert that actual is True."""
-        if not self.actual:
-            error_msg = msg or f"Expected True, but got {self.actual}"
-            raise AssertionError(error_msg)
+        actual = self.actual
+        if not actual:
+            raise AssertionError(msg or f"Expected True, but got {_format_value(actual)}")
     
     def to_be_false(self, msg: Optional[str] = None):
         """Assert that actual is False."""
-        if self.actual:
-            error_msg = msg or f"Expected False, but got {self.actual}"
-            raise AssertionError(error_msg)
+        actual = self.actual
+        if actual:
+            raise AssertionError(msg or f"Expected False, but got {_format_value(actual)}")
     
     def to_be_almost_equal(self, expected: float, delta: float = 0.0001, msg: Optional[str] = None):
         """Assert that actual is approximately equal to expected."""
-        if abs(self.actual - expected) > delta:
-            error_msg = msg or f"Expected {expected} ± {delta}, but got {self.actual}"
-            raise AssertionError(error_msg)
+        actual = self.actual
+        if abs(actual - expected) > delta:
+            raise AssertionError(
+                msg or f"Expected {_format_value(expected)} ± {delta}, but got {_format_value(actual)}"
+            )
 
     def to_match_snapshot(self, name: Optional[str] = None, serializer: Optional[Callable] = None):
         """
@@ -224,9 +251,11 @@ class Expectation:
             expect(result).to_match_snapshot()
             expect(config).to_match_snapshot("config_v1")
         """
-        from .snapshot import get_snapshot_manager
+        global _get_snapshot_manager
+        if _get_snapshot_manager is None:
+            from .snapshot import get_snapshot_manager as _get_snapshot_manager
 
-        manager = get_snapshot_manager()
+        manager = _get_snapshot_manager()
         result = manager.match_snapshot(self.actual, name=name, serializer=serializer)
 
         if not result.matched:
@@ -246,32 +275,79 @@ def expect(actual: Any) -> Expectation:
     Usage:
         expect(add(2, 3)).to_equal(5)
         expect(is_even(4)).to_be_true()
+
+    Each call returns a new Expectation. They are not pooled: in
+    expect(x).to_equal(helper()) the argument is evaluated after expect(x),
+    so a shared instance would be rebound by any expect() inside helper().
     """
     return Expectation(actual)
 
 
-# Convenience assertion functions (alternative to fluent API)
+# Convenience assertion functions (alternative to fluent API). They inline
+# the Expectation checks to skip the object and a method call per assertion.
 def assert_equal(actual: Any, expected: Any, msg: Optional[str] = None):
     """Assert that actual equals expected."""
-    expect(actual).to_equal(expected, msg)
+    if actual is expected or actual == expected:
+        return
+    raise AssertionError(
+        msg or f"Expected {_format_value(expected)}, but got {_format_value(actual)}"
+    )
 
 
 def assert_not_equal(actual: Any, expected: Any, msg: Optional[str] = None):
     """Assert that actual does not equal expected."""
-    expect(actual).to_not_equal(expected, msg)
+    if actual == expected:
+        raise AssertionError(
+            msg or f"Expected not {_format_value(expected)}, but got {_format_value(actual)}"
+        )
 
 
 def assert_true(condition: bool, msg: Optional[str] = None):
     """Assert that condition is True."""
-    expect(condition).to_be_true(msg)
+    if not condition:
+        raise AssertionError(msg or f"Expected True, but got {_format_value(condition)}")
 
 
 def assert_false(condition: bool, msg: Optional[str] = None):
     """Assert that condition is False."""
-    expect(condition).to_be_false(msg)
+    if condition:
+        raise AssertionError(msg or f"Expected False, but got {_format_value(condition)}")
 
 
 def assert_almost_equal(actual: float, expected: float, delta: float = 0.0001, msg: Optional[str] = None):
     """Assert that actual is approximately equal to expected."""
-    expect(actual).to_be_almost_equal(expected, delta, msg)
+    if abs(actual - expected) > delta:
+        raise AssertionError(
+            msg or f"Expected {_format_value(expected)} ± {delta}, but got {_format_value(actual)}"
+        )
+
+
+def assert_all_almost_equal(
+    actual: Sequence[float],
+    expected: Sequence[float],
+    delta: float = 0.0001,
+    msg: Optional[str] = None,
+):
+    """
+    Assert that two sequences of numbers are element-wise approximately equal.
 
+    Checks a whole buffer (list, array.array, ctypes array, ...) returned
+    from Zig in one call, instead of one expect() per element.
+    """
+    if len(actual) != len(expected):
+        raise AssertionError(msg or f"Expected {len(expected)} values, but got {len(actual)}")
+
+    # Plain zip iteration; the index is only worked out on failure
+    for a, e in zip(actual, expected):
+        if abs(a - e) > delta:
+            break
+    else:
+        return
+
+    index = next(
+        i for i, (a, e) in enumerate(zip(actual, expected)) if abs(a - e) > delta
+    )
+    raise AssertionError(msg or (
+        f"Expected {_format_value(expected[index])} ± {delta} at index {index}, "
+        f"but got {_format_value(actual[index])}"
+    ))
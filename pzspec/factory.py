@@ -5,7 +5,8 @@ Inspired by FactoryBot/Factory Boy, provides a declarative way to define
 test data factories with defaults, sequences, and traits.
 """
 
-from typing import Any, Callable, Dict, List, Optional, Type
+from functools import partial
+from typing import Any, Callable, Dict, FrozenSet, Iterator, List, Optional, Tuple, Type
 import ctypes
 
 
@@ -51,70 +52,145 @@ def factory_field(default: Any = None, lazy: bool = False) -> FactoryField:
     return FactoryField(default=default, lazy=lazy)
 
 
+def _identity(n: int) -> int:
+    """Sequence function for plain counters; Sequence.next skips calling it."""
+    return n
+
+
 class Sequence:
     """
     Auto-incrementing sequence for generating unique values.
 
     Usage:
         class EntityFactory(StructFactory):
-            id = sequence(lambda n: n)
+            id = sequence()
             name = sequence(lambda n: f"entity_{n}")
     """
 
-    def __init__(self, func: Callable[[int], Any]):
+    def __init__(self, func: Optional[Callable[[int], Any]] = None):
         """
         Initialize a sequence.
 
         Args:
             func: Callable that takes counter value and returns generated value
+                (default: the counter value itself)
         """
-        self.func = func
+        self.func = func if func is not None else _identity
         self.counter = 0
 
     def next(self) -> Any:
         """Get the next value in the sequence."""
         self.counter += 1
-        return self.func(self.counter)
+        func = self.func
+        if func is _identity:
+            return self.counter
+        return func(self.counter)
 
     def reset(self):
         """Reset the sequence counter."""
         self.counter = 0
 
 
-def sequence(func: Callable[[int], Any]) -> Sequence:
+def sequence(func: Optional[Callable[[int], Any]] = None) -> Sequence:
     """
     Create an auto-incrementing sequence.
 
     Args:
-        func: Callable that takes counter (starting at 1) and returns value
+        func: Callable that takes counter (starting at 1) and returns value.
+            If omitted, the sequence yields the counter itself.
 
     Returns:
         Sequence instance
 
     Example:
-        id = sequence(lambda n: n)           # 1, 2, 3, ...
+        id = sequence()                      # 1, 2, 3, ...
         name = sequence(lambda n: f"vec_{n}") # vec_1, vec_2, ...
     """
     return Sequence(func)
 
 
-def trait(method: Callable) -> Callable:
+def trait(method: Optional[Callable] = None, *, pure: bool = False) -> Callable:
     """
     Decorator to mark a method as a trait (named preset).
 
     Traits are converted to classmethods that build instances with preset values.
 
+    Args:
+        pure: The method always returns the same values, so it is only
+            called once per factory class and its result is reused
+
     Usage:
         class Vec2Factory(StructFactory):
             @trait
             def unit_x(self):
                 return {"x": 1.0, "y": 0.0}
 
+            @trait(pure=True)
+            def unit_y(self):
+                return {"x": 0.0, "y": 1.0}
+
         # Then use as:
         vec = Vec2Factory.unit_x()
     """
-    method._is_trait = True
-    return method
+    def mark(method: Callable) -> Callable:
+        method._is_trait = True
+        method._trait_pure = pure
+        return method
+
+    if method is None:
+        return mark
+    return mark(method)
+
+
+def _call_trait(trait_name: str, cls, /, **overrides) -> ctypes.Structure:
+    """Build an instance of cls from a trait's preset values and overrides."""
+    method = cls._factory_traits[trait_name]
+    if getattr(method, '_trait_pure', False):
+        # Reuse the values from the first call on this class. The dict is
+        # never modified or handed out, so it is safe to share.
+        cache = cls.__dict__.get('_pure_trait_values')
+        if cache is None:
+            cache = {}
+            cls._pure_trait_values = cache
+        trait_values = cache.get(trait_name)
+        if trait_values is None:
+            trait_values = cache[trait_name] = method(cls)
+    else:
+        # Get trait values by calling the method
+        trait_values = method(cls)
+    if overrides:
+        # Merge with overrides (overrides take precedence). The trait's dict
+        # isn't updated in place, since a trait may return a shared dict.
+        trait_values = {**trait_values, **overrides}
+    # build() receives its own copy through **, so no merge is needed otherwise
+    return cls.build(**trait_values)
+
+
+# ctypes' own initializers, which set fields from keyword arguments in C
+_FIELD_INITS = (ctypes.Structure.__init__, ctypes.Union.__init__)
+
+# ctypes' own constructors, which from_buffer_copy() also uses
+_STOCK_NEWS = (ctypes.Structure.__new__, ctypes.Union.__new__)
+
+# Simple type codes that hold or point to memory owned elsewhere
+# (c_char_p, c_wchar_p, c_void_p, py_object)
+_REFERENCE_TYPE_CODES = frozenset('zZPO')
+
+
+def _is_plain_data(ctype: type) -> bool:
+    """
+    Whether ctype's value is fully held in its own bytes: numbers and
+    characters, or arrays and structs of them. Copying such a value's
+    buffer is the same as building it; pointers are not, since ctypes keeps
+    the objects they point to alive separately.
+    """
+    if issubclass(ctype, ctypes._SimpleCData):
+        return ctype._type_ not in _REFERENCE_TYPE_CODES
+    if issubclass(ctype, ctypes.Array):
+        return _is_plain_data(ctype._type_)
+    if issubclass(ctype, (ctypes.Structure, ctypes.Union)):
+        return all(_is_plain_data(f[1]) for f in ctype._fields_)
+    return False
 
 
 class StructFactoryMeta(type):
@@ -157,22 +233,29 @@ class StructFactoryMeta(type):
         # Create the class
         cls = super().__new__(mcs, name, bases, namespace)
 
-        # Create trait classmethods
-        for trait_name, trait_method in traits.items():
-            def make_trait_classmethod(method):
-                @classmethod
-                def trait_classmethod(cls, **overrides):
-                    # Get trait values by calling the method
-                    trait_values = method(cls)
-                    # Merge with overrides (overrides take precedence)
-                    merged = {**trait_values, **overrides}
-                    return cls.build(**merged)
-                return trait_classmethod
-
-            setattr(cls, trait_name, make_trait_classmethod(trait_method))
+        # Create trait classmethods, all sharing one function
+        for trait_name in traits:
+            setattr(cls, trait_name, classmethod(partial(_call_trait, trait_name)))
 
         return cls
 
+    def __call__(cls, **overrides) -> ctypes.Structure:
+        """
+        Factory(**overrides): build a struct directly, skipping type.__call__
+        and StructFactory.__new__.
+
+        Factories that define their own __new__ go through type.__call__ as
+        usual, so that __new__ still runs.
+        """
+        if cls.__new__ is not StructFactory.__new__:
+            return super().__call__(**overrides)
+        if not overrides:
+            # Copy the prebuilt defaults, where every build() would be the same
+            template = cls._get_default_template()
+            if template is not None:
+                return type(template).from_buffer_copy(template)
+        return cls.build(**overrides)
+
 
 class StructFactory(metaclass=StructFactoryMeta):
     """
@@ -198,6 +281,7 @@ class StructFactory(metaclass=StructFactoryMeta):
         vec = Vec2Factory(x=5.0)         # (5.0, 0.0)
         vec = Vec2Factory.unit_x()       # (1.0, 0.0)
         vecs = Vec2Factory.build_batch(3) # 3 instances
+        arr = Vec2Factory.build_array(3)  # 3 instances in one ctypes array
     """
 
     struct_class: Optional[Type[ctypes.Structure]] = None
@@ -249,17 +333,68 @@ class StructFactory(metaclass=StructFactoryMeta):
         # Apply overrides
         values.update(overrides)
 
+        struct_class = cls.struct_class
+        struct_field_names = cls._get_struct_field_names()
+
+        # Usually every value is a struct field, so ctypes can set them all
+        # from keywords; a custom __init__ may not accept them
+        if struct_class.__init__ in _FIELD_INITS and struct_field_names.issuperset(values):
+            return struct_class(**values)
+
         # Create struct instance
-        struct = cls.struct_class()
+        struct = struct_class()
 
         # Set field values (only those that exist on the struct)
-        struct_field_names = {f[0] for f in cls.struct_class._fields_}
         for field_name, value in values.items():
             if field_name in struct_field_names:
                 setattr(struct, field_name, value)
 
         return struct
 
+    @classmethod
+    def _get_default_template(cls) -> Optional[ctypes.Structure]:
+        """
+        Struct built from the defaults alone, or None if build() without
+        overrides can differ between calls.
+
+        Only factories without sequences or lazy fields, using the stock
+        build() and a struct of plain data (no pointers) without a custom
+        __init__ or __new__, have a template; a copy of its bytes is then
+        the same as a fresh build(). Cached per class and struct_class, so
+        field defaults are read once.
+        """
+        cached = cls.__dict__.get('_default_template')
+        if cached is None or cached[0] is not cls.struct_class:
+            struct_class = cls.struct_class
+            template = None
+            if (struct_class is not None
+                    and not cls._factory_sequences
+                    and not any(field.lazy for field in cls._factory_fields.values())
+                    and cls.build.__func__ is StructFactory.build.__func__
+                    and struct_class.__init__ in _FIELD_INITS
+                    and struct_class.__new__ in _STOCK_NEWS
+                    and _is_plain_data(struct_class)):
+                template = cls.build()
+            cached = (struct_class, template)
+            cls._default_template = cached
+        return cached[1]
+
+    @classmethod
+    def _get_struct_field_names(cls) -> FrozenSet[str]:
+        """
+        Names of struct_class's fields.
+
+        Cached on the factory class on first use and recomputed if
+        struct_class is reassigned. This is lazy rather than done in the
+        metaclass because struct_class (or its _fields_) may be set after
+        the factory is defined.
+        """
+        cached = cls.__dict__.get('_struct_field_names')
+        if cached is None or cached[0] is not cls.struct_class:
+            cached = (cls.struct_class, frozenset(f[0] for f in cls.struct_class._fields_))
+            cls._struct_field_names = cached
+        return cached[1]
+
     @classmethod
     def build_batch(cls, count: int, **overrides) -> List[ctypes.Structure]:
         """
@@ -272,7 +407,100 @@ class StructFactory(metaclass=StructFactoryMeta):
         Returns:
             List of struct instances
         """
-        return [cls.build(**overrides) for _ in range(count)]
+        struct_class = cls.struct_class
+        # Subclasses that customize build() get it called for every instance
+        if (struct_class is None or count <= 0
+                or cls.build.__func__ is not StructFactory.build.__func__):
+            return [cls.build(**overrides) for _ in range(count)]
+
+        # Set fields in the same order build() does, from keywords when every
+        # value is a struct field
+        order, assigned = cls._batch_fields(overrides)
+        use_keywords = (struct_class.__init__ in _FIELD_INITS
+                        and len(assigned) == len(order))
+
+        structs = []
+        for values in cls._batch_values(count, overrides):
+            if use_keywords:
+                structs.append(struct_class(**values))
+                continue
+
+            struct = struct_class()
+            for field_name in assigned:
+                setattr(struct, field_name, values[field_name])
+            structs.append(struct)
+
+        return structs
+
+    @classmethod
+    def build_array(cls, count: int, **overrides) -> ctypes.Array:
+        """
+        Build multiple struct instances in one contiguous ctypes array.
+
+        The array can be passed to Zig as a pointer to its first element
+        without copying, e.g. for a `[*]const Vec2` parameter.
+
+        Args:
+            count: Number of instances to create
+            **overrides: Field values to override defaults (applied to all)
+
+        Returns:
+            A (struct_class * count) array
+        """
+        struct_class = cls.struct_class
+        if struct_class is None:
+            raise ValueError(
+                f"{cls.__name__} must define 'struct_class' "
+                "pointing to a ctypes.Structure subclass"
+            )
+
+        # Array elements are zero-filled without calling __init__, so a custom
+        # __init__ or build() needs whole structs built and copied in
+        if (struct_class.__init__ not in _FIELD_INITS
+                or cls.build.__func__ is not StructFactory.build.__func__):
+            return (struct_class * count)(*cls.build_batch(count, **overrides))
+
+        # Fill each element in place
+        array = (struct_class * count)()
+        _, assigned = cls._batch_fields(overrides)
+        for element, values in zip(array, cls._batch_values(count, overrides)):
+            for field_name in assigned:
+                setattr(element, field_name, values[field_name])
+
+        return array
+
+    @classmethod
+    def _batch_fields(cls, overrides: Dict[str, Any]) -> Tuple[Dict[str, None], List[str]]:
+        """
+        Names of the values a batch build resolves, in build() order, and
+        those of them that are struct fields.
+        """
+        order = dict.fromkeys([*cls._factory_fields, *cls._factory_sequences, *overrides])
+        struct_field_names = cls._get_struct_field_names()
+        return order, [name for name in order if name in struct_field_names]
+
+    @classmethod
+    def _batch_values(cls, count: int, overrides: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Yield the resolved values for count instances, as build() would."""
+        # Everything except lazy fields and sequences is the same for every
+        # instance, so resolve it once instead of once per build()
+        static = {}
+        lazy = []
+        for field_name, field in cls._factory_fields.items():
+            if field.lazy and callable(field.default):
+                lazy.append((field_name, field.default))
+            else:
+                static[field_name] = field.default
+        sequences = list(cls._factory_sequences.items())
+
+        for _ in range(count):
+            values = dict(static)
+            for field_name, func in lazy:
+                values[field_name] = func()
+            for seq_name, seq in sequences:
+                values[seq_name] = seq.next()
+            values.update(overrides)
+            yield values
 
     @classmethod
     def reset_sequences(cls):
@@ -8,15 +8,30 @@ Generates JUnit XML format output compatible with:
 - Any CI system that parses JUnit XML
 """
 
-import xml.etree.ElementTree as ET
-from xml.dom import minidom
+from xml.sax.saxutils import escape
 from pathlib import Path
-from typing import List, Optional, Dict
+from typing import Iterator, List, Optional, Dict, Tuple
 from dataclasses import dataclass
 import time
 
+from ._compat import DATACLASS_SLOTS
 
-@dataclass
+
+# Quotes are escaped in text too, as minidom's pretty printer did
+_ENTITIES = {'"': "&quot;"}
+
+
+def _escape(data: str) -> str:
+    """Escape text or a double-quoted attribute value for XML."""
+    return escape(data, _ENTITIES)
+
+
+def _attributes(attrs: List[Tuple[str, str]]) -> str:
+    """Format (name, value) pairs as XML attributes, each with a leading space."""
+    return "".join(f' {name}="{_escape(value)}"' for name, value in attrs)
+
+
+@dataclass(**DATACLASS_SLOTS)
 class JUnitTestCase:
     """Represents a single test case in JUnit format."""
     name: str
@@ -30,7 +45,7 @@ class JUnitTestCase:
     skip_message: Optional[str] = None
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class JUnitTestSuite:
     """Represents a test suite in JUnit format."""
     name: str
@@ -49,6 +64,9 @@ class JUnitReportGenerator:
     def __init__(self):
         self.testsuites: List[JUnitTestSuite] = []
         self.start_time: Optional[float] = None
+        # Classname for each describe context path. Tests in the same block
+        # share one, so each path is converted once across add_results calls.
+        self._classname_cache: Dict[str, str] = {}
 
     def start(self):
         """Mark the start of test execution."""
@@ -68,15 +86,18 @@ class JUnitReportGenerator:
         skipped = 0
         total_time = 0.0
 
+        classnames = self._classname_cache
+
         for result in results:
             # Parse the test name to get classname and method name
-            if "::" in result.name:
-                parts = result.name.rsplit("::", 1)
-                classname = parts[0].replace(" > ", ".").replace(" ", "_")
-                name = parts[1]
+            context, separator, name = result.name.rpartition("::")
+            if separator:
+                classname = classnames.get(context)
+                if classname is None:
+                    classname = context.replace(" > ", ".").replace(" ", "_")
+                    classnames[context] = classname
             else:
                 classname = context_name
-                name = result.name
 
             tc = JUnitTestCase(
                 name=name,
@@ -85,13 +106,14 @@ class JUnitReportGenerator:
             )
 
             if not result.passed:
-                if result.error:
-                    if "AssertionError" in result.error or "Expected" in result.error:
-                        tc.failure_message = result.error
+                error = result.error
+                if error:
+                    if "AssertionError" in error or "Expected" in error:
+                        tc.failure_message = error
                         tc.failure_type = "AssertionError"
                         failures += 1
                     else:
-                        tc.error_message = result.error
+                        tc.error_message = error
                         tc.error_type = "Error"
                         errors += 1
                 else:
@@ -132,66 +154,100 @@ class JUnitReportGenerator:
         Returns:
             XML string in JUnit format
         """
-        # Create root element
-        testsuites = ET.Element("testsuites")
-
-        # Calculate totals
-        total_tests = sum(s.tests for s in self.testsuites)
-        total_failures = sum(s.failures for s in self.testsuites)
-        total_errors = sum(s.errors for s in self.testsuites)
-        total_skipped = sum(s.skipped for s in self.testsuites)
-        total_time = sum(s.time for s in self.testsuites)
-
-        testsuites.set("tests", str(total_tests))
-        testsuites.set("failures", str(total_failures))
-        testsuites.set("errors", str(total_errors))
-        testsuites.set("skipped", str(total_skipped))
-        testsuites.set("time", f"{total_time:.3f}")
+        return "\n".join(line for chunk in self._xml_chunks() for line in chunk)
 
+    def _xml_chunks(self) -> Iterator[List[str]]:
+        """
+        Yield the lines of the pretty-printed report, one suite at a time,
+        so it can be written out without holding the whole document.
+        """
+        # Calculate totals in one pass over the suites
+        total_tests = total_failures = total_errors = total_skipped = 0
+        total_time = 0.0
+        for suite in self.testsuites:
+            total_tests += suite.tests
+            total_failures += suite.failures
+            total_errors += suite.errors
+            total_skipped += suite.skipped
+            total_time += suite.time
+
+        attrs = _attributes([
+            ("tests", str(total_tests)),
+            ("failures", str(total_failures)),
+            ("errors", str(total_errors)),
+            ("skipped", str(total_skipped)),
+            ("time", f"{total_time:.3f}"),
+        ])
+
+        # Write the pretty-printed document directly instead of building an
+        # ElementTree and round-tripping it through minidom to indent it
+        if not self.testsuites:
+            yield ['<?xml version="1.0" ?>', f"<testsuites{attrs}/>"]
+            return
+
+        yield ['<?xml version="1.0" ?>', f"<testsuites{attrs}>"]
         for suite in self.testsuites:
-            testsuite = ET.SubElement(testsuites, "testsuite")
-            testsuite.set("name", suite.name)
-            testsuite.set("tests", str(suite.tests))
-            testsuite.set("failures", str(suite.failures))
-            testsuite.set("errors", str(suite.errors))
-            testsuite.set("skipped", str(suite.skipped))
-            testsuite.set("time", f"{suite.time:.3f}")
-            if suite.timestamp:
-                testsuite.set("timestamp", suite.timestamp)
-
-            for tc in suite.testcases:
-                testcase = ET.SubElement(testsuite, "testcase")
-                testcase.set("name", tc.name)
-                testcase.set("classname", tc.classname)
-                testcase.set("time", f"{tc.time:.3f}")
-
-                if tc.failure_message:
-                    failure = ET.SubElement(testcase, "failure")
-                    failure.set("message", tc.failure_message)
-                    if tc.failure_type:
-                        failure.set("type", tc.failure_type)
-                    failure.text = tc.failure_message
-
-                if tc.error_message:
-                    error = ET.SubElement(testcase, "error")
-                    error.set("message", tc.error_message)
-                    if tc.error_type:
-                        error.set("type", tc.error_type)
-                    error.text = tc.error_message
-
-                if tc.skipped:
-                    skipped = ET.SubElement(testcase, "skipped")
-                    if tc.skip_message:
-                        skipped.set("message", tc.skip_message)
-
-        # Pretty print
-        xml_str = ET.tostring(testsuites, encoding="unicode")
-        dom = minidom.parseString(xml_str)
-        pretty_xml = dom.toprettyxml(indent="  ")
-
-        # Remove extra blank lines and add XML declaration
-        lines = [line for line in pretty_xml.split("\n") if line.strip()]
-        return "\n".join(lines)
+            # Remove extra blank lines
+            lines = [line for line in self._suite_xml(suite).split("\n") if line.strip()]
+            if lines:
+                yield lines
+        yield ["</testsuites>"]
+
+    def _suite_xml(self, suite: JUnitTestSuite) -> str:
+        """Pretty-printed <testsuite> element, indented for <testsuites>."""
+        suite_attrs = [
+            ("name", suite.name),
+            ("tests", str(suite.tests)),
+            ("failures", str(suite.failures)),
+            ("errors", str(suite.errors)),
+            ("skipped", str(suite.skipped)),
+            ("time", f"{suite.time:.3f}"),
+        ]
+        if suite.timestamp:
+            suite_attrs.append(("timestamp", suite.timestamp))
+
+        if not suite.testcases:
+            return f"  <testsuite{_attributes(suite_attrs)}/>\n"
+
+        parts = [f"  <testsuite{_attributes(suite_attrs)}>\n"]
+        # Tests in a suite mostly share a few classnames; escape each once
+        classnames: Dict[str, str] = {}
+        for tc in suite.testcases:
+            classname = classnames.get(tc.classname)
+            if classname is None:
+                classname = classnames[tc.classname] = _escape(tc.classname)
+            # The time is a formatted number, so it needs no escaping
+            tc_attrs = f' name="{_escape(tc.name)}" classname="{classname}" time="{tc.time:.3f}"'
+
+            children = []
+            if tc.failure_message:
+                # The message is both an attribute and the text; escape it once
+                message = _escape(tc.failure_message)
+                failure_type = f' type="{_escape(tc.failure_type)}"' if tc.failure_type else ""
+                children.append(
+                    f'      <failure message="{message}"{failure_type}>{message}</failure>\n'
+                )
+
+            if tc.error_message:
+                message = _escape(tc.error_message)
+                error_type = f' type="{_escape(tc.error_type)}"' if tc.error_type else ""
+                children.append(
+                    f'      <error message="{message}"{error_type}>{message}</error>\n'
+                )
+
+            if tc.skipped:
+                skip_message = f' message="{_escape(tc.skip_message)}"' if tc.skip_message else ""
+                children.append(f"      <skipped{skip_message}/>\n")
+
+            if children:
+                parts.append(f"    <testcase{tc_attrs}>\n")
+                parts.extend(children)
+                parts.append("    </testcase>\n")
+            else:
+                parts.append(f"    <testcase{tc_attrs}/>\n")
+
+        parts.append("  </testsuite>\n")
+        return "".join(parts)
 
     def write_to_file(self, filepath: str):
         """
@@ -200,10 +256,16 @@ class JUnitReportGenerator:
         Args:
             filepath: Path to the output file
         """
-        xml_content = self.generate_xml()
         path = Path(filepath)
         path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(xml_content, encoding="utf-8")
+
+        # Stream suite by suite rather than building the whole document first
+        with open(path, "w", encoding="utf-8") as f:
+            separator = ""
+            for lines in self._xml_chunks():
+                f.write(separator)
+                f.write("\n".join(lines))
+                separator = "\n"
 
 
 def generate_junit_xml(results: List, output_path: str, suite_name: str = "pzspec"):
@@ -39,12 +39,50 @@ export fn __pzspec_reset_tracking() void {
 // Use the tracking allocator in your code
 pub const allocator = gpa.allocator();
 ```
+
+Optionally, also export the number of frees made so far (counted alongside
+allocations, e.g. by a wrapping allocator):
+
+```zig
+export fn __pzspec_get_freed_count() usize {
+    return freed_count;
+}
+```
+
+With it, a tracked block that neither allocates nor frees anything reuses
+the previous leak count instead of calling __pzspec_get_leaked_bytes again,
+which may walk the heap.
+
+A library that counts frees can also export both counters in one call, which
+pzspec then uses to read them in start_tracking()/stop_tracking() (one FFI
+call each; the leak scan stays a separate call, made only when needed):
+
+```zig
+const PzspecState = extern struct {
+    allocation_count: usize,
+    freed_count: usize,
+};
+
+export fn __pzspec_get_state(out: *PzspecState) void {
+    out.* = .{
+        .allocation_count = allocation_count,
+        .freed_count = freed_count,
+    };
+}
+```
 """
 
 import ctypes
-from typing import Optional, List, Callable
+from typing import Optional, List, Callable, Tuple
 from dataclasses import dataclass, field
-from contextlib import contextmanager
+
+
+class _TrackState(ctypes.Structure):
+    """Counters filled in by __pzspec_get_state."""
+    _fields_ = [
+        ('allocation_count', ctypes.c_size_t),
+        ('freed_count', ctypes.c_size_t),
+    ]
 
 
 @dataclass
@@ -54,6 +92,16 @@ class AllocationInfo:
     size: int
     source_file: Optional[str] = None
     source_line: Optional[int] = None
+    # " at file:line" suffix for leak reports, or "" if the source is unknown
+    location: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if not self.source_file:
+            self.location = ""
+        elif self.source_line:
+            self.location = f" at {self.source_file}:{self.source_line}"
+        else:
+            self.location = f" at {self.source_file}"
 
 
 @dataclass
@@ -85,21 +133,62 @@ class MemoryTracker:
             lib: The loaded Zig library (ctypes.CDLL)
         """
         self._lib = lib
+        self._get_freed_count: Optional[Callable[[], int]] = None
+        self._get_state: Optional[Callable] = None
         self._has_tracking = self._check_tracking_support()
         self._initial_allocation_count = 0
-        self._initial_leaked_bytes = 0
+        self._initial_freed_count = 0
+        # (allocation count, freed count, leaked bytes) at the last leak scan
+        self._last_scan: Optional[Tuple[int, int, int]] = None
 
     def _check_tracking_support(self) -> bool:
-        """Check if the Zig library has memory tracking support."""
+        """
+        Check if the Zig library has memory tracking support, resolving
+        the tracking functions once so later calls are a single FFI call.
+        """
+        # Note: getattr() is needed because __pzspec names would trigger
+        # Python's name mangling if accessed as attributes directly
         try:
-            # Try to access the tracking functions
-            _ = self._lib.__pzspec_get_allocation_count
-            _ = self._lib.__pzspec_get_leaked_bytes
-            _ = self._lib.__pzspec_reset_tracking
-            return True
+            get_count = getattr(self._lib, '__pzspec_get_allocation_count')
+            get_leaked = getattr(self._lib, '__pzspec_get_leaked_bytes')
+            reset = getattr(self._lib, '__pzspec_reset_tracking')
         except AttributeError:
             return False
 
+        get_count.argtypes = []
+        get_count.restype = ctypes.c_size_t
+        get_leaked.argtypes = []
+        get_leaked.restype = ctypes.c_size_t
+        reset.argtypes = []
+        reset.restype = None
+
+        self._get_allocation_count = get_count
+        self._get_leaked_bytes = get_leaked
+        self._reset_tracking = reset
+
+        # Optional: lets stop_tracking() skip repeated leak scans
+        try:
+            get_freed = getattr(self._lib, '__pzspec_get_freed_count')
+        except AttributeError:
+            pass
+        else:
+            get_freed.argtypes = []
+            get_freed.restype = ctypes.c_size_t
+            self._get_freed_count = get_freed
+
+        # Optional: reads both counters in one call, into a reused buffer
+        try:
+            get_state = getattr(self._lib, '__pzspec_get_state')
+        except AttributeError:
+            pass
+        else:
+            get_state.argtypes = [ctypes.POINTER(_TrackState)]
+            get_state.restype = None
+            self._get_state = get_state
+            self._state = _TrackState()
+            self._state_ref = ctypes.byref(self._state)
+        return True
+
     @property
     def is_available(self) -> bool:
         """Check if memory tracking is available."""
@@ -109,46 +198,80 @@ class MemoryTracker:
         """Get the current number of allocations."""
         if not self._has_tracking:
             return 0
-        func = self._lib.__pzspec_get_allocation_count
-        func.restype = ctypes.c_size_t
-        return func()
+        return self._get_allocation_count()
 
     def get_leaked_bytes(self) -> int:
         """Get the number of leaked bytes."""
         if not self._has_tracking:
             return 0
-        func = self._lib.__pzspec_get_leaked_bytes
-        func.restype = ctypes.c_size_t
-        return func()
+        return self._get_leaked_bytes()
 
     def reset(self):
         """Reset the memory tracking state."""
         if not self._has_tracking:
             return
-        func = self._lib.__pzspec_reset_tracking
-        func.restype = None
-        func()
+        self._reset_tracking()
+        self._last_scan = None
 
     def start_tracking(self):
         """Start tracking allocations (record initial state)."""
+        if self._get_state is not None:
+            self._get_state(self._state_ref)
+            state = self._state
+            self._initial_allocation_count = state.allocation_count
+            self._initial_freed_count = state.freed_count
+            return
+
         self._initial_allocation_count = self.get_allocation_count()
-        self._initial_leaked_bytes = self.get_leaked_bytes()
+        if self._get_freed_count is not None:
+            self._initial_freed_count = self._get_freed_count()
 
     def stop_tracking(self) -> LeakReport:
         """
         Stop tracking and return a leak report.
 
+        leaked_bytes is the library's current leak total. If the library
+        exports __pzspec_get_freed_count and nothing was allocated or freed
+        since the last leak scan, that scan's result is reused instead of
+        scanning again.
+
         Returns:
             LeakReport with leak information
         """
-        current_count = self.get_allocation_count()
-        leaked_bytes = self.get_leaked_bytes()
+        if self._get_state is not None:
+            self._get_state(self._state_ref)
+            state = self._state
+            allocation_count = state.allocation_count
+            freed_count: Optional[int] = state.freed_count
+        else:
+            allocation_count = self.get_allocation_count()
+            freed_count = None
+            if self._get_freed_count is not None:
+                freed_count = self._get_freed_count()
+
+        if freed_count is None:
+            leaked_bytes = self.get_leaked_bytes()
+        else:
+            leaked_bytes = self._last_scan_or(allocation_count, freed_count)
+            if leaked_bytes is None:
+                leaked_bytes = self.get_leaked_bytes()
+                self._last_scan = (allocation_count, freed_count, leaked_bytes)
 
         return LeakReport(
             leaked_bytes=leaked_bytes,
-            allocation_count=current_count - self._initial_allocation_count,
+            allocation_count=allocation_count - self._initial_allocation_count,
         )
 
+    def _last_scan_or(self, allocation_count: int, freed_count: int) -> Optional[int]:
+        """
+        Leaked bytes from the last scan if the allocation and freed counts
+        are unchanged since (so the heap is too), otherwise None.
+        """
+        last_scan = self._last_scan
+        if last_scan is not None and last_scan[:2] == (allocation_count, freed_count):
+            return last_scan[2]
+        return None
+
 
 # Global memory tracker instance
 _memory_tracker: Optional[MemoryTracker] = None
@@ -172,8 +295,42 @@ def init_memory_tracker_from_library(lib: ctypes.CDLL):
     return _memory_tracker
 
 
-@contextmanager
-def track_memory():
+class _TrackMemory:
+    """
+    Context manager returned by track_memory().
+
+    A plain class rather than @contextmanager, since it wraps every test
+    run with leak checking and a generator-based manager costs more to
+    enter and exit.
+    """
+
+    __slots__ = ('report', 'tracker')
+
+    def __enter__(self) -> LeakReport:
+        tracker = get_memory_tracker()
+        if tracker is not None and not tracker.is_available:
+            tracker = None
+        self.tracker = tracker
+        self.report = LeakReport(leaked_bytes=0, allocation_count=0)
+
+        if tracker is not None:
+            tracker.start_tracking()
+        # No tracking available: the report stays empty
+        return self.report
+
+    def __exit__(self, *exc_info) -> bool:
+        tracker = self.tracker
+        if tracker is not None:
+            # Populate the report with actual values
+            final_report = tracker.stop_tracking()
+            report = self.report
+            report.leaked_bytes = final_report.leaked_bytes
+            report.allocation_count = final_report.allocation_count
+            report.allocations = final_report.allocations
+        return False
+
+
+def track_memory() -> _TrackMemory:
     """
     Context manager to track memory allocations during a block of code.
 
@@ -191,25 +348,7 @@ def track_memory():
         The report is populated when the context exits, not during.
         Access report.has_leaks and report.leaked_bytes after the with block.
     """
-    tracker = get_memory_tracker()
-
-    report = LeakReport(leaked_bytes=0, allocation_count=0)
-
-    if tracker is None or not tracker.is_available:
-        # No tracking available, yield empty report
-        yield report
-        return
-
-    tracker.start_tracking()
-
-    try:
-        yield report
-    finally:
-        # Populate the report with actual values
-        final_report = tracker.stop_tracking()
-        report.leaked_bytes = final_report.leaked_bytes
-        report.allocation_count = final_report.allocation_count
-        report.allocations = final_report.allocations
+    return _TrackMemory()
 
 
 class MemoryLeakError(AssertionError):
@@ -232,13 +371,10 @@ class MemoryLeakError(AssertionError):
         lines.append(f"  Total: {self.report.leaked_bytes} bytes leaked")
         lines.append(f"  Allocations: {self.report.allocation_count}")
 
-        for alloc in self.report.allocations:
-            loc = ""
-            if alloc.source_file:
-                loc = f" at {alloc.source_file}"
-                if alloc.source_line:
-                    loc += f":{alloc.source_line}"
-            lines.append(f"  - {alloc.size} bytes{loc}")
+        lines.extend(
+            f"  - {alloc.size} bytes{alloc.location}"
+            for alloc in self.report.allocations
+        )
 
         return "\n".join(lines)
 
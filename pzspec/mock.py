@@ -11,19 +11,24 @@ Note: This approach has limitations:
 """
 
 import ctypes
-from typing import Any, Callable, List, Optional, Union
+from typing import Any, Callable, List, NamedTuple, Optional, Union
 from dataclasses import dataclass, field
 from contextlib import contextmanager
 
+from ._compat import DATACLASS_SLOTS
 
-@dataclass
-class MockCall:
-    """Record of a call to a mocked function."""
+
+class MockCall(NamedTuple):
+    """
+    Record of a call to a mocked function.
+
+    A named tuple rather than a dataclass, since one is built per mocked call.
+    """
     args: tuple
-    kwargs: dict = field(default_factory=dict)
+    kwargs: dict
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class MockConfig:
     """Configuration for a mocked function."""
     returns: Any = None
@@ -31,6 +36,8 @@ class MockConfig:
     side_effect: Optional[Callable] = None
     call_count: int = 0
     calls: List[MockCall] = field(default_factory=list)
+    # When False only call_count is kept; calls stays empty
+    record_calls: bool = True
     _sequence_index: int = 0
 
 
@@ -75,21 +82,24 @@ class MockRegistry:
             raise ValueError(f"No mock registered for '{name}'")
 
         # Record the call
-        config.calls.append(MockCall(args=args, kwargs=kwargs))
+        if config.record_calls:
+            config.calls.append(MockCall(args, kwargs))
         config.call_count += 1
 
         # Handle side_effect (callable)
-        if config.side_effect is not None:
-            return config.side_effect(*args, **kwargs)
+        side_effect = config.side_effect
+        if side_effect is not None:
+            return side_effect(*args, **kwargs)
 
         # Handle returns_sequence
-        if config.returns_sequence is not None:
-            if config._sequence_index < len(config.returns_sequence):
-                result = config.returns_sequence[config._sequence_index]
-                config._sequence_index += 1
-                return result
+        sequence = config.returns_sequence
+        if sequence is not None:
+            index = config._sequence_index
+            if index < len(sequence):
+                config._sequence_index = index + 1
+                return sequence[index]
             # If sequence exhausted, return the last value
-            return config.returns_sequence[-1] if config.returns_sequence else None
+            return sequence[-1] if sequence else None
 
         # Handle simple returns
         return config.returns
@@ -114,6 +124,7 @@ def mock_zig_function(
     returns: Any = None,
     returns_sequence: Optional[List[Any]] = None,
     side_effect: Optional[Callable] = None,
+    record: bool = True,
 ):
     """
     Context manager to mock a Zig function during a test.
@@ -126,6 +137,9 @@ def mock_zig_function(
         returns: A fixed value to return for all calls
         returns_sequence: A sequence of values to return in order
         side_effect: A callable to execute instead of the function
+        record: Keep the arguments of every call for get_calls() and
+            assert_called_with(). Pass False for mocks called in tight
+            loops that are only checked by call count.
 
     Usage:
         with mock_zig_function("external_api", returns=42):
@@ -152,6 +166,7 @@ def mock_zig_function(
         returns=returns,
         returns_sequence=returns_sequence,
         side_effect=side_effect,
+        record_calls=record,
     )
 
     registry = get_mock_registry()
@@ -163,6 +178,15 @@ def mock_zig_function(
         registry.unregister_mock(name)
 
 
+# Python type a mocked result is converted to, by the function's restype
+_CONVERTERS = {
+    ctypes.c_int32: int,
+    ctypes.c_float: float,
+    ctypes.c_double: float,
+    ctypes.c_bool: bool,
+}
+
+
 class MockFunction:
     """
     A wrapper that acts like a ctypes function but returns mocked values.
@@ -175,21 +199,16 @@ class MockFunction:
         self.argtypes = argtypes
         self.restype = restype
         self._registry = get_mock_registry()
+        self._converter = _CONVERTERS.get(restype)
 
     def __call__(self, *args, **kwargs):
         """Call the mock and return the configured result."""
         result = self._registry.call_mock(self.name, *args, **kwargs)
 
         # Convert result to the expected return type if needed
-        if self.restype is not None and result is not None:
-            if self.restype == ctypes.c_int32:
-                return int(result)
-            elif self.restype == ctypes.c_float:
-                return float(result)
-            elif self.restype == ctypes.c_double:
-                return float(result)
-            elif self.restype == ctypes.c_bool:
-                return bool(result)
+        converter = self._converter
+        if converter is not None and result is not None:
+            return converter(result)
 
         return result
 
@@ -214,11 +233,18 @@ def assert_called_once(name: str, msg: Optional[str] = None):
         raise AssertionError(error_msg)
 
 
+def _check_recording(name: str, config: MockConfig):
+    """Raise if the mock was set up with record=False, so has no call history."""
+    if not config.record_calls:
+        raise AssertionError(f"Mock '{name}' does not record its calls (record=False)")
+
+
 def assert_called_with(name: str, *args, **kwargs):
     """Assert that a mocked function was called with specific arguments."""
     config = get_mock_registry().get_mock_config(name)
     if config is None:
         raise AssertionError(f"No mock registered for '{name}'")
+    _check_recording(name, config)
     if not config.calls:
         raise AssertionError(f"Expected '{name}' to be called, but it was not")
 
@@ -239,8 +265,13 @@ def get_call_count(name: str) -> int:
 
 
 def get_calls(name: str) -> List[MockCall]:
-    """Get all calls made to a mocked function."""
+    """
+    Get all calls made to a mocked function.
+
+    Raises AssertionError if the mock was set up with record=False.
+    """
     config = get_mock_registry().get_mock_config(name)
     if config is None:
         return []
+    _check_recording(name, config)
     return config.calls
@@ -61,20 +61,28 @@ expect(entity_id).to_not_be_sentinel(NO_ENTITY)
 
 import ctypes
 from typing import Any, Optional, Union
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
+from ._compat import DATACLASS_SLOTS
 
-@dataclass
+
+@dataclass(frozen=True, eq=False, **DATACLASS_SLOTS)
 class Sentinel:
     """
     Represents a sentinel value for FFI optional/nullable patterns.
 
     A sentinel is a special value that indicates "no value" or "invalid"
     when the type doesn't have a natural null representation.
+
+    Sentinels are immutable, so their hash is computed once.
     """
     value: Any
     name: str = "SENTINEL"
     description: str = ""
+    _hash: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, '_hash', hash(self.value))
 
     def is_sentinel(self, val: Any) -> bool:
         """Check if a value equals this sentinel."""
@@ -91,7 +99,7 @@ class Sentinel:
         return self.value == other
 
     def __hash__(self) -> int:
-        return hash(self.value)
+        return self._hash
 
     def __repr__(self) -> str:
         return f"Sentinel({self.name}={self.value})"
@@ -168,15 +176,19 @@ def add_sentinel_assertions(expectation_class):
     This is called automatically when pzspec is imported.
     """
 
+    # The checks compare against sentinel.value inline (the same test as
+    # Sentinel.is_sentinel) to save a method call per assertion
+
     def to_be_sentinel(self, sentinel: Sentinel, msg: Optional[str] = None):
         """Assert that the value IS the sentinel (no valid value)."""
-        if not sentinel.is_sentinel(self.actual):
-            error_msg = msg or f"Expected {sentinel.name} ({sentinel.value}), but got {self.actual}"
+        actual = self.actual
+        if not actual == sentinel.value:
+            error_msg = msg or f"Expected {sentinel.name} ({sentinel.value}), but got {actual}"
             raise AssertionError(error_msg)
 
     def to_not_be_sentinel(self, sentinel: Sentinel, msg: Optional[str] = None):
         """Assert that the value is NOT the sentinel (has a valid value)."""
-        if sentinel.is_sentinel(self.actual):
+        if self.actual == sentinel.value:
             error_msg = msg or f"Expected a valid value, but got {sentinel.name} ({sentinel.value})"
             raise AssertionError(error_msg)
 
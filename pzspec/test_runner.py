@@ -9,11 +9,48 @@ import time
 import inspect
 import os
 import re
-from typing import Callable, List, Optional, Set
+import threading
+import functools
+from typing import Callable, List, Optional, Pattern, Set
 from dataclasses import dataclass, field
 from contextlib import contextmanager
 
 
+@functools.lru_cache(maxsize=64)
+def _compile_filter_pattern(pattern: str) -> Callable[[str], bool]:
+    """
+    Parse a -k filter pattern into a matcher function.
+
+    Cached by pattern string, so each distinct expression is parsed once.
+    See TestRunner._parse_filter_pattern for the supported syntax.
+    """
+    pattern = pattern.strip()
+
+    # Handle boolean operators (case-insensitive)
+    lower_pattern = pattern.lower()
+
+    # Split on " and " first (highest precedence after grouping)
+    if " and " in lower_pattern:
+        parts = re.split(r'\s+and\s+', pattern, flags=re.IGNORECASE)
+        matchers = [_compile_filter_pattern(p) for p in parts]
+        return lambda name: all(m(name) for m in matchers)
+
+    # Split on " or "
+    if " or " in lower_pattern:
+        parts = re.split(r'\s+or\s+', pattern, flags=re.IGNORECASE)
+        matchers = [_compile_filter_pattern(p) for p in parts]
+        return lambda name: any(m(name) for m in matchers)
+
+    # Handle "not " prefix
+    if lower_pattern.startswith("not "):
+        inner_pattern = pattern[4:].strip()
+        inner_matcher = _compile_filter_pattern(inner_pattern)
+        return lambda name: not inner_matcher(name)
+
+    # Simple case-insensitive substring match (pattern lowered once, not per name)
+    return lambda name: lower_pattern in name.lower()
+
+
 @dataclass
 class TestResult:
     """Result of a single test execution."""
@@ -113,14 +150,44 @@ class TestRunner:
     """
 
     def __init__(self):
+        # Current context is tracked per thread so test files can be loaded concurrently
+        self._local = threading.local()
         self.root = Context(name="", parent=None)
-        self.current_context: Context = self.root
+        self.current_context = self.root
         self.results: List[TestResult] = []
 
         # Legacy compatibility
         self.suites: List[Context] = []
         self.current_suite: Optional[Context] = None
 
+    @property
+    def current_context(self) -> Context:
+        """The context that new tests and hooks are added to in this thread."""
+        return getattr(self._local, "context", self.root)
+
+    @current_context.setter
+    def current_context(self, context: Context):
+        self._local.context = context
+
+    def order_by_source_files(self, source_files: List[str]):
+        """
+        Reorder top-level contexts and tests to follow the given file order.
+
+        Used after loading test files concurrently, where registration order
+        depends on thread scheduling. The sort is stable, so definition order
+        within each file is preserved.
+        """
+        order = {self._normalize_path(f): i for i, f in enumerate(source_files)}
+        last = len(order)
+
+        def key(item) -> int:
+            if not item.source_file:
+                return last
+            return order.get(self._normalize_path(item.source_file), last)
+
+        self.root.children.sort(key=key)
+        self.root.tests.sort(key=key)
+
     @contextmanager
     def describe(self, name: str, tags: Optional[List[str]] = None):
         """
@@ -469,6 +536,7 @@ class TestRunner:
         filter_regex: bool = False,
         include_tags: Optional[List[str]] = None,
         exclude_tags: Optional[List[str]] = None,
+        filter_compiled: Optional[Pattern] = None,
     ) -> bool:
         """
         Run all collected tests, optionally filtered by file:line, name pattern, or tags.
@@ -480,6 +548,8 @@ class TestRunner:
             filter_regex: Whether to treat filter_pattern as a regex
             include_tags: Only run tests with at least one of these tags
             exclude_tags: Exclude tests with any of these tags
+            filter_compiled: Optional pre-compiled regex for filter_pattern
+                             (used when filter_regex is True)
 
         Returns:
             True if all tests passed, False otherwise
@@ -488,7 +558,9 @@ class TestRunner:
 
         # Apply name pattern filter first
         if filter_pattern:
-            filter_set = self._filter_tests_by_pattern(filter_pattern, filter_regex)
+            filter_set = self._filter_tests_by_pattern(
+                filter_pattern, filter_regex, filter_compiled
+            )
             if not filter_set:
                 print(f"Error: No tests matched pattern '{filter_pattern}'", file=sys.stderr)
                 return False
@@ -576,42 +648,23 @@ class TestRunner:
         Returns:
             A function that takes a test name and returns True if it matches
         """
-        pattern = pattern.strip()
-
-        # Handle boolean operators (case-insensitive)
-        lower_pattern = pattern.lower()
-
-        # Split on " and " first (highest precedence after grouping)
-        if " and " in lower_pattern:
-            parts = re.split(r'\s+and\s+', pattern, flags=re.IGNORECASE)
-            matchers = [self._parse_filter_pattern(p) for p in parts]
-            return lambda name: all(m(name) for m in matchers)
-
-        # Split on " or "
-        if " or " in lower_pattern:
-            parts = re.split(r'\s+or\s+', pattern, flags=re.IGNORECASE)
-            matchers = [self._parse_filter_pattern(p) for p in parts]
-            return lambda name: any(m(name) for m in matchers)
-
-        # Handle "not " prefix
-        if lower_pattern.startswith("not "):
-            inner_pattern = pattern[4:].strip()
-            inner_matcher = self._parse_filter_pattern(inner_pattern)
-            return lambda name: not inner_matcher(name)
-
-        # Simple case-insensitive substring match
-        return lambda name: pattern.lower() in name.lower()
+        return _compile_filter_pattern(pattern)
 
-    def _parse_regex_pattern(self, pattern: str) -> Callable[[str], bool]:
+    def _parse_regex_pattern(
+        self, pattern: str, compiled: Optional[Pattern] = None
+    ) -> Callable[[str], bool]:
         """
         Parse a regex pattern and return a matcher function.
 
         Args:
             pattern: The regex pattern string
+            compiled: Optional pre-compiled regex for pattern (skips compiling)
 
         Returns:
             A function that takes a test name and returns True if it matches
         """
+        if compiled is not None:
+            return lambda name: compiled.search(name) is not None
         try:
             regex = re.compile(pattern, re.IGNORECASE)
             return lambda name: regex.search(name) is not None
@@ -621,7 +674,8 @@ class TestRunner:
             return lambda name: pattern.lower() in name.lower()
 
     def _filter_tests_by_pattern(
-        self, pattern: str, use_regex: bool = False
+        self, pattern: str, use_regex: bool = False,
+        compiled: Optional[Pattern] = None,
     ) -> set:
         """
         Find tests matching a name pattern.
@@ -629,12 +683,13 @@ class TestRunner:
         Args:
             pattern: The filter pattern
             use_regex: Whether to use regex matching
+            compiled: Optional pre-compiled regex (used when use_regex is True)
 
         Returns:
             A set of test IDs (using id()) that match the pattern
         """
         if use_regex:
-            matcher = self._parse_regex_pattern(pattern)
+            matcher = self._parse_regex_pattern(pattern, compiled)
         else:
             matcher = self._parse_filter_pattern(pattern)
 
@@ -4,7 +4,6 @@ FFI wrapper for loading and calling Zig functions via C ABI.
 
 import ctypes
 import os
-import platform
 from pathlib import Path
 from typing import Any, Callable, Optional
 from .builder import auto_build
@@ -65,18 +64,9 @@ class ZigLibrary:
     
     def _find_library(self) -> str:
         """Try to find the library in common build locations."""
-        from .builder import PZSpecConfig
+        from .builder import PZSpecConfig, _supported_lib_ext
         
-        system = platform.system()
-        
-        if system == "Darwin":
-            ext = ".dylib"
-        elif system == "Linux":
-            ext = ".so"
-        elif system == "Windows":
-            ext = ".dll"
-        else:
-            raise RuntimeError(f"Unsupported platform: {system}")
+        ext = _supported_lib_ext()
         
         # Try to use project config to find library
         project_root = Path.cwd()
@@ -128,8 +118,7 @@ class ZigLibrary:
         """
         # Check if function is mocked
         from .mock import get_mock_registry, MockFunction
-        registry = get_mock_registry()
-        if registry.is_mocked(name):
+        if get_mock_registry().get_mock_config(name) is not None:
             return MockFunction(name, argtypes, restype)
 
         if name not in self._functions:
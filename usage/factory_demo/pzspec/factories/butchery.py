@@ -84,7 +84,7 @@ class SmallButcheryFactory(StructFactory):
     """Factory for creating SmallButchery test instances."""
     struct_class = SmallButchery
 
-    id = sequence(lambda n: n)
+    id = sequence()  # 1, 2, 3, ...
     workers = factory_field(default=0)
     meat_stored = factory_field(default=0)
     efficiency = factory_field(default=1.0)
@@ -174,9 +174,9 @@ class MeatProductFactory(StructFactory):
     def game(self):
         return {"meat_type": MeatType.GAME, "weight": 4.0}
 
-    @trait
+    @trait(pure=True)
     def premium(self):
-        """High quality meat."""
+        """High quality meat (constant values, so computed once and reused)."""
         return {"quality": 1.5, "weight": 2.0}
 
     @trait
@@ -16,7 +16,10 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from pzspec import ZigLibrary, describe, it, expect, assert_almost_equal
+from pzspec import (
+    ZigLibrary, describe, it, expect, assert_almost_equal,
+    StructFactory, factory_field, trait,
+)
 import ctypes
 
 # Add the pzspec directory to the path for factory imports
@@ -193,6 +196,16 @@ with describe("SmallButcheryFactory - Python Factory"):
         expect(b2.id).to_equal(2)
         expect(b3.id).to_equal(3)
 
+    @it("should continue the sequence across batches and restart after reset")
+    def test_sequence_batches_and_reset():
+        SmallButcheryFactory.reset_sequences()
+        first = SmallButcheryFactory.build_batch(2)
+        second = SmallButcheryFactory.build_batch(2)
+        expect([b.id for b in first + second]).to_equal([1, 2, 3, 4])
+
+        SmallButcheryFactory.reset_sequences()
+        expect(SmallButcheryFactory().id).to_equal(1)
+
     @it("should create batch of butcheries")
     def test_batch_creation():
         butcheries = SmallButcheryFactory.build_batch(5, is_active=True)
@@ -297,3 +310,82 @@ with describe("Factory Patterns - Advanced Usage"):
         for product in products:
             meat_product_process(product, butchery.efficiency)
             expect(product.processed).to_equal(True)
+
+
+with describe("Factory Patterns - Contiguous Arrays"):
+
+    @it("should build a ctypes array of structs with overrides applied")
+    def test_build_array_contents():
+        products = MeatProductFactory.build_array(4, meat_type=MeatType.PORK)
+        expect(isinstance(products, MeatProduct * 4)).to_be_true()
+        expect(len(products)).to_equal(4)
+        for product in products:
+            expect(product.meat_type).to_equal(MeatType.PORK)
+            assert_almost_equal(product.weight, 1.0, delta=0.01)
+            expect(product.processed).to_equal(False)
+
+    @it("should number array elements from the factory's sequence")
+    def test_build_array_sequence():
+        SmallButcheryFactory.reset_sequences()
+        butcheries = SmallButcheryFactory.build_array(3, is_active=True)
+        expect([b.id for b in butcheries]).to_equal([1, 2, 3])
+        expect(all(b.is_active for b in butcheries)).to_be_true()
+        # The sequence carries on after the array
+        expect(SmallButcheryFactory().id).to_equal(4)
+
+    @it("should let Zig update array elements in place")
+    def test_build_array_in_place():
+        products = MeatProductFactory.build_array(3)
+        # Elements are views into the array's buffer, not copies
+        meat_product_process(products[1], 0.5)
+        expect(products[0].processed).to_equal(False)
+        expect(products[1].processed).to_equal(True)
+        assert_almost_equal(products[1].quality, 0.5, delta=0.01)
+        expect(products[2].processed).to_equal(False)
+
+
+# Records each call of its pure trait, to show the values are computed once
+_game_trait_calls = []
+
+
+class GameProductFactory(StructFactory):
+    """MeatProduct factory whose pure trait counts its calls."""
+    struct_class = MeatProduct
+
+    meat_type = factory_field(default=MeatType.GAME)
+    weight = factory_field(default=1.0)
+    quality = factory_field(default=1.0)
+    processed = factory_field(default=False)
+
+    @trait(pure=True)
+    def trophy(self):
+        _game_trait_calls.append(1)
+        return {"weight": 8.0, "quality": 2.0}
+
+
+with describe("Factory Patterns - Pure Traits"):
+
+    @it("should build from a pure trait like a regular trait")
+    def test_pure_trait_values():
+        premium = MeatProductFactory.premium()
+        assert_almost_equal(premium.quality, 1.5, delta=0.01)
+        assert_almost_equal(premium.weight, 2.0, delta=0.01)
+
+    @it("should call a pure trait's method only once per factory")
+    def test_pure_trait_called_once():
+        first = GameProductFactory.trophy()
+        second = GameProductFactory.trophy()
+        expect(len(_game_trait_calls)).to_equal(1)
+        assert_almost_equal(first.weight, 8.0, delta=0.01)
+        assert_almost_equal(second.weight, 8.0, delta=0.01)
+        # Each call still builds a separate struct
+        expect(first is second).to_be_false()
+
+    @it("should not let overrides change the cached trait values")
+    def test_pure_trait_overrides():
+        light = GameProductFactory.trophy(weight=0.5)
+        assert_almost_equal(light.weight, 0.5, delta=0.01)
+        assert_almost_equal(light.quality, 2.0, delta=0.01)
+
+        regular = GameProductFactory.trophy()
+        assert_almost_equal(regular.weight, 8.0, delta=0.01)
@@ -15,6 +15,7 @@ const allocator = gpa.allocator();
 
 // Track allocation statistics manually since GPA doesn't expose counts directly
 var allocation_count: usize = 0;
+var freed_count: usize = 0;
 var total_allocated: usize = 0;
 var total_freed: usize = 0;
 
@@ -23,6 +24,11 @@ export fn __pzspec_get_allocation_count() usize {
     return allocation_count;
 }
 
+// Optional: lets PZSpec skip the leak check when every allocation was freed
+export fn __pzspec_get_freed_count() usize {
+    return freed_count;
+}
+
 export fn __pzspec_get_leaked_bytes() usize {
     if (total_allocated > total_freed) {
         return total_allocated - total_freed;
@@ -30,8 +36,23 @@ export fn __pzspec_get_leaked_bytes() usize {
     return 0;
 }
 
+// Optional: both counters in one call, so PZSpec reads them with one FFI
+// call per start/stop of tracking
+const PzspecState = extern struct {
+    allocation_count: usize,
+    freed_count: usize,
+};
+
+export fn __pzspec_get_state(out: *PzspecState) void {
+    out.* = .{
+        .allocation_count = allocation_count,
+        .freed_count = freed_count,
+    };
+}
+
 export fn __pzspec_reset_tracking() void {
     allocation_count = 0;
+    freed_count = 0;
     total_allocated = 0;
     total_freed = 0;
 }
@@ -95,6 +116,7 @@ export fn destroy_buffer(handle: usize) bool {
     const buffer = buffers[handle] orelse return false;
 
     // Track deallocation
+    freed_count += 2; // buffer struct + data array
     total_freed += @sizeOf(Buffer) + buffer.size;
 
     // Free the data
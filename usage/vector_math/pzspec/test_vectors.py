@@ -14,7 +14,7 @@ sys.path.insert(0, str(project_root))
 
 # Import from the framework package
 from pzspec.zig_ffi import ZigLibrary
-from pzspec.dsl import describe, it, expect, assert_almost_equal
+from pzspec.dsl import describe, it, expect, assert_almost_equal, assert_all_almost_equal
 import ctypes
 
 # Add the pzspec directory to the path for factory imports
@@ -302,3 +302,36 @@ with describe("Factory - Vec3 Creation"):
         expect(v.y).to_equal(0.0)
         expect(v.z).to_equal(5.0)
 
+
+with describe("Buffers - Element-wise Comparison"):
+
+    @it("should compare a vector's components in one assertion")
+    def test_all_almost_equal_components():
+        result = vec2_normalize(vec2_new(3.0, 4.0))
+        assert_all_almost_equal([result.x, result.y], [0.6, 0.8], delta=0.001)
+
+    @it("should compare a ctypes float buffer")
+    def test_all_almost_equal_buffer():
+        cross = vec3_cross(vec3_new(1.0, 2.0, 3.0), vec3_new(4.0, 5.0, 6.0))
+        buffer = (ctypes.c_float * 3)(cross.x, cross.y, cross.z)
+        assert_all_almost_equal(buffer, [-3.0, 6.0, -3.0])
+
+    @it("should report the index of the first mismatch")
+    def test_all_almost_equal_mismatch():
+        try:
+            assert_all_almost_equal([1.0, 2.0, 3.0], [1.0, 2.5, 3.5])
+        except AssertionError as e:
+            message = str(e)
+        else:
+            message = ""
+        expect("at index 1" in message).to_be_true()
+
+    @it("should fail when the lengths differ")
+    def test_all_almost_equal_length():
+        try:
+            assert_all_almost_equal([1.0, 2.0], [1.0, 2.0, 3.0])
+        except AssertionError as e:
+            message = str(e)
+        else:
+            message = ""
+        expect(message).to_equal("Expected 3 values, but got 2")